@@ -6,20 +6,20 @@ def create_complex_test_image():
     img = np.ones((720, 1280, 3), dtype=np.uint8) * 200  # Light gray for sky
     
     # Add some clouds (light gray patches)
-    for _ in range(5):
-        x = np.random.randint(0, 1180)
-        y = np.random.randint(0, 200)
-        cv2.circle(img, (x, y), 50, (240, 240, 240), -1)
+    xs = np.random.randint(0, 1180, size=5)
+    ys = np.random.randint(0, 200, size=5)
+    for x, y in zip(xs, ys):
+        cv2.circle(img, (int(x), int(y)), 50, (240, 240, 240), -1)
     
     # Draw power lines (dark lines with perspective)
-    # First pole
-    cv2.line(img, (200, 100), (200, 600), (80, 80, 80), 4)  # Vertical pole
-    # Second pole
-    cv2.line(img, (1000, 150), (1000, 700), (80, 80, 80), 4)  # Vertical pole
+    # Both vertical poles in one call
+    poles = np.array([[(200, 100), (200, 600)],
+                      [(1000, 150), (1000, 700)]], np.int32)
+    cv2.polylines(img, poles, isClosed=False, color=(80, 80, 80), thickness=4)
     
-    # Power lines with perspective
-    for offset in [0, 30, 60]:  # Multiple lines
-        cv2.line(img, (200, 200 + offset), (1000, 250 + offset), (60, 60, 60), 2)
+    # Power lines with perspective (multiple lines, one call)
+    lines = np.array([[(200, 200 + o), (1000, 250 + o)] for o in (0, 30, 60)], np.int32)
+    cv2.polylines(img, lines, isClosed=False, color=(60, 60, 60), thickness=2)
     
     # Add some "foreign objects"
     # Bird near power line
@@ -36,10 +36,13 @@ def create_complex_test_image():
     # Save both original and a version with annotations
     cv2.imwrite('test_image_complex.jpg', img)
     
-    # Add annotations for ground truth
-    cv2.rectangle(img, (480, 210), (520, 250), (0, 255, 0), 2)  # Bird
-    cv2.rectangle(img, (695, 275), (735, 305), (0, 255, 0), 2)  # Drone
-    cv2.rectangle(img, (290, 260), (410, 360), (0, 255, 0), 2)  # Tree branch
+    # Add annotations for ground truth (bird, drone, tree branch) as closed boxes
+    boxes = [((480, 210), (520, 250)),
+             ((695, 275), (735, 305)),
+             ((290, 260), (410, 360))]
+    outlines = np.array([[(x1, y1), (x2, y1), (x2, y2), (x1, y2)]
+                         for (x1, y1), (x2, y2) in boxes], np.int32)
+    cv2.polylines(img, outlines, isClosed=True, color=(0, 255, 0), thickness=2)
     cv2.imwrite('test_image_complex_annotated.jpg', img)
     
     print("Created test images: test_image_complex.jpg and test_image_complex_annotated.jpg")
@@ -5,9 +5,10 @@ import numpy as np
 img = np.zeros((480, 640, 3), dtype=np.uint8)
 img.fill(255)  # Make it white
 
-# Draw some simulated power lines
-cv2.line(img, (100, 100), (540, 100), (100, 100, 100), 2)  # Horizontal line
-cv2.line(img, (100, 200), (540, 200), (100, 100, 100), 2)  # Horizontal line
+# Draw some simulated power lines (both horizontal lines in one call)
+lines = np.array([[(100, 100), (540, 100)],
+                  [(100, 200), (540, 200)]], np.int32)
+cv2.polylines(img, lines, isClosed=False, color=(100, 100, 100), thickness=2)
 
 # Draw a "foreign object" near the line
 cv2.rectangle(img, (300, 80), (350, 120), (0, 0, 255), -1)  # Red rectangle
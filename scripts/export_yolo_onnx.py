@@ -1,6 +1,8 @@
 import argparse
+import os
 import sys
 from pathlib import Path
+from typing import List
 import numpy as np
 import cv2
 import onnxruntime as ort
@@ -57,24 +59,132 @@ def preprocess_image(image_path: str, image_size: int = 640) -> np.ndarray:
     if img is None:
         raise ValueError(f"Could not read image: {image_path}")
         
-    # Resize and convert to float32
-    img = cv2.resize(img, (image_size, image_size))
-    img = cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
+    # Resize, BGR->RGB, normalize to [0, 1] and NCHW layout in one pass.
+    # The blob comes back as a single contiguous float32 array.
+    return cv2.dnn.blobFromImage(img, scalefactor=1.0 / 255.0,
+                                 size=(image_size, image_size),
+                                 swapRB=True, crop=False)
+
+# Execution providers selectable with --provider
+PROVIDERS = {
+    'cpu': ('CPUExecutionProvider', {'arena_extend_strategy': 'kSameAsRequested'}),
+    'tensorrt': ('TensorrtExecutionProvider', {}),
+    'cuda': ('CUDAExecutionProvider', {}),
+    'openvino': ('OpenVINOExecutionProvider', {'device_type': 'CPU_FP32'}),
+    'openvino_gpu': ('OpenVINOExecutionProvider', {'device_type': 'GPU_FP16'}),
+}
+
+# Order tried by provider='auto', fastest first
+AUTO_PROVIDER_ORDER = ['tensorrt', 'cuda', 'openvino', 'cpu']
+
+def pick_provider() -> str:
+    """Pick the fastest provider this onnxruntime build actually has."""
+    available = ort.get_available_providers()
+    for provider in AUTO_PROVIDER_ORDER:
+        if PROVIDERS[provider][0] in available:
+            return provider
+    return 'cpu'
+
+def create_session(onnx_path: str, provider: str = 'auto') -> ort.InferenceSession:
+    """
+    Create a tuned ONNX Runtime session.
+    Turns on every graph optimization. On the plain CPU provider the optimized
+    graph is also saved next to the model (model.opt.onnx), so later runs can
+    skip the optimization step.
+    
+    Args:
+        onnx_path: Path to the ONNX model
+        provider: 'auto' (fastest available), or one of PROVIDERS. Falls back
+            to CPU if the requested provider isn't in this onnxruntime build.
+    """
+    if provider == 'auto':
+        provider = pick_provider()
+    if provider not in PROVIDERS:
+        raise ValueError(f"Unknown provider: {provider}")
+    provider_name, provider_options = PROVIDERS[provider]
+    if provider_name not in ort.get_available_providers():
+        print(f"Warning: {provider_name} not available, falling back to CPU")
+        provider = 'cpu'
+        provider_name, provider_options = PROVIDERS[provider]
+    
+    providers = [(provider_name, provider_options)]
+    if provider != 'cpu':
+        # Let anything the accelerator can't handle run on the CPU
+        providers.append(PROVIDERS['cpu'])
+    
+    so = ort.SessionOptions()
+    so.intra_op_num_threads = os.cpu_count() or 1
+    so.execution_mode = ort.ExecutionMode.ORT_SEQUENTIAL
+    so.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+    
+    model_path = Path(onnx_path)
+    load_path = model_path
+    if provider == 'cpu':
+        optimized_path = model_path.with_suffix('.opt.onnx')
+        if optimized_path.exists() and optimized_path.stat().st_mtime >= model_path.stat().st_mtime:
+            # Already optimized on a previous run
+            load_path = optimized_path
+            so.graph_optimization_level = ort.GraphOptimizationLevel.ORT_DISABLE_ALL
+        else:
+            so.optimized_model_filepath = str(optimized_path)
+    
+    return ort.InferenceSession(str(load_path), sess_options=so, providers=providers)
+
+def quantize_onnx(onnx_path: str, quant_path: str, calib_images: List[str],
+                  image_size: int = 640) -> bool:
+    """
+    Make an INT8 copy of the model using static quantization.
+    About 4x smaller and a lot faster on CPUs with VNNI.
+    
+    Args:
+        onnx_path: FP32 ONNX model to quantize
+        quant_path: Where to save the INT8 model
+        calib_images: Sample images used to pick the quantization ranges
+        image_size: Model input size
+        
+    Returns:
+        True if it worked, False if something went wrong
+    """
+    try:
+        from onnxruntime.quantization import CalibrationDataReader, QuantType, quantize_static
+    except ImportError:
+        print("Error: onnxruntime.quantization is not available")
+        return False
     
-    # Normalize to [0, 1] and transpose to NCHW format
-    img = img.astype(np.float32) / 255.0
-    img = np.transpose(img, (2, 0, 1))
-    img = np.expand_dims(img, axis=0)
+    class ImageCalibrationReader(CalibrationDataReader):
+        """Feeds preprocessed calibration images to the quantizer one at a time."""
+        
+        def __init__(self, input_name: str):
+            self.input_name = input_name
+            self._images = iter(calib_images)
+            
+        def get_next(self):
+            image_path = next(self._images, None)
+            if image_path is None:
+                return None
+            return {self.input_name: preprocess_image(image_path, image_size)}
     
-    return img
+    try:
+        input_name = ort.InferenceSession(
+            onnx_path, providers=['CPUExecutionProvider']).get_inputs()[0].name
+        quantize_static(onnx_path, quant_path,
+                        ImageCalibrationReader(input_name),
+                        activation_type=QuantType.QInt8,
+                        weight_type=QuantType.QInt8)
+        return Path(quant_path).exists()
+        
+    except Exception as e:
+        print(f"Error during quantization: {str(e)}")
+        return False
 
-def validate_onnx_model(onnx_path: str, image_path: str, image_size: int = 640) -> bool:
+def validate_onnx_model(onnx_path: str, image_path: str, image_size: int = 640,
+                        provider: str = 'auto') -> bool:
     """
     Validate ONNX model by running inference on a sample image.
     """
     try:
         # Create inference session
-        session = ort.InferenceSession(onnx_path, providers=['CPUExecutionProvider'])
+        session = create_session(onnx_path, provider)
         
         # Get model metadata
         input_name = session.get_inputs()[0].name
@@ -82,8 +192,13 @@ def validate_onnx_model(onnx_path: str, image_path: str, image_size: int = 640)
         # Preprocess image
         img = preprocess_image(image_path, image_size)
         
-        # Run inference
-        outputs = session.run(None, {input_name: img})
+        # Run inference, binding the input in place to avoid a copy
+        io_binding = session.io_binding()
+        io_binding.bind_cpu_input(input_name, img)
+        for output in session.get_outputs():
+            io_binding.bind_output(output.name)
+        session.run_with_iobinding(io_binding)
+        outputs = io_binding.copy_outputs_to_cpu()
         
         # Check output shape and content
         if len(outputs) == 0:
@@ -114,6 +229,12 @@ def main():
     parser.add_argument('--output', required=True, help='Output path for ONNX model')
     parser.add_argument('--image', required=True, help='Path to sample image for validation')
     parser.add_argument('--size', type=int, default=640, help='Input image size (default: 640)')
+    parser.add_argument('--provider', choices=['auto'] + sorted(PROVIDERS), default='auto',
+                        help='Execution provider used for validation (default: auto, fastest available)')
+    parser.add_argument('--quantize', action='store_true',
+                        help='Also write an INT8 copy of the model (<output>.int8.onnx)')
+    parser.add_argument('--calib-dir',
+                        help='Directory of calibration images for --quantize (default: --image only)')
     
     args = parser.parse_args()
     
@@ -127,11 +248,31 @@ def main():
     
     # Validate model
     print(f"\nValidating ONNX model with sample image...")
-    if not validate_onnx_model(args.output, args.image, args.size):
+    if not validate_onnx_model(args.output, args.image, args.size, args.provider):
         print("Validation failed!")
         return 1
         
     print("\nValidation successful!")
+    
+    # Optional INT8 quantization
+    if args.quantize:
+        if args.calib_dir:
+            calib_images = sorted(str(p) for p in Path(args.calib_dir).iterdir()
+                                  if p.suffix.lower() in ('.jpg', '.jpeg', '.png'))
+        else:
+            calib_images = [args.image]
+        quant_path = str(Path(args.output).with_suffix('.int8.onnx'))
+        
+        print(f"\nQuantizing to INT8 with {len(calib_images)} calibration image(s)...")
+        if not quantize_onnx(args.output, quant_path, calib_images, args.size):
+            print("Quantization failed!")
+            return 1
+        
+        print(f"Successfully quantized to: {quant_path}")
+        if not validate_onnx_model(quant_path, args.image, args.size, args.provider):
+            print("Validation of quantized model failed!")
+            return 1
+    
     return 0
 
 if __name__ == '__main__':
@@ -0,0 +1,64 @@
+import argparse
+import sys
+from pathlib import Path
+from ultralytics import YOLO
+
+def export_yolo_to_openvino(weights_path: str, data_yaml: str, image_size: int = 640,
+                            int8: bool = True, fraction: float = 1.0) -> str:
+    """
+    Converts our YOLO model to an OpenVINO model for the Pi / x86 CPUs.
+    With int8 on, Ultralytics calibrates on images from the dataset so the
+    weights end up about 4x smaller and inference a lot quicker on CPU.
+
+    Args:
+        weights_path: Where the trained model is saved
+        data_yaml: Dataset yaml whose val images are used for calibration
+        image_size: Size of images it expects (usually leave at 640)
+        int8: Quantize to INT8 (False keeps FP32)
+        fraction: Fraction of the dataset to calibrate on (1.0 = all of it)
+
+    Returns:
+        Path of the exported model folder, or an empty string if it failed
+    """
+    try:
+        model = YOLO(weights_path)
+        out_dir = model.export(format="openvino",
+                               imgsz=image_size,
+                               int8=int8,
+                               data=data_yaml,
+                               fraction=fraction)
+        return str(out_dir) if out_dir and Path(out_dir).exists() else ""
+
+    except Exception as e:
+        print(f"Error during OpenVINO export: {str(e)}")
+        return ""
+
+def main():
+    parser = argparse.ArgumentParser(description='Export YOLO model to (INT8) OpenVINO')
+    parser.add_argument('--weights', required=True, help='Path to YOLO weights file')
+    parser.add_argument('--data', required=True,
+                       help='Dataset yaml used for INT8 calibration')
+    parser.add_argument('--size', type=int, default=640, help='Input image size (default: 640)')
+    parser.add_argument('--fp32', action='store_true',
+                       help='Skip INT8 quantization and export FP32')
+    parser.add_argument('--fraction', type=float, default=1.0,
+                       help='Fraction of the dataset to calibrate on (default: 1.0)')
+
+    args = parser.parse_args()
+
+    if not Path(args.weights).exists():
+        print(f"Error: Weights file not found: {args.weights}")
+        return 1
+
+    out_dir = export_yolo_to_openvino(args.weights, args.data, args.size,
+                                      int8=not args.fp32, fraction=args.fraction)
+    if not out_dir:
+        print("Export failed!")
+        return 1
+
+    print(f"OpenVINO model written to {out_dir}")
+    print(f"Run it with: --yolo-weights {out_dir}")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,38 +1,78 @@
 import argparse
+import csv
 import cv2
+import math
 import numpy as np
 import os
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from pathlib import Path
 
-def calculate_entropy(image):
-    """Figures out how much 'stuff' is going on in the image.
-    Helps us spot frames that are basically the same or just empty."""
-    histogram = cv2.calcHist([image], [0], None, [256], [0, 256])
-    histogram_norm = histogram.ravel() / histogram.sum()
-    non_zero_probs = histogram_norm[histogram_norm > 0]
-    entropy = -np.sum(non_zero_probs * np.log2(non_zero_probs))
-    return entropy
+# Add the project root directory to Python path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if project_root not in sys.path:
+    sys.path.append(project_root)
 
-def calculate_variance(image):
-    """Calculate image variance as an alternative measure."""
-    return cv2.meanStdDev(image)[1][0][0]
+from src.metrics_numba import entropy_variance_u8, warmup as warmup_metrics
 
-def is_similar_to_previous(current_frame, prev_metrics, threshold=0.1):
+def compute_metrics(gray):
+    """Measure a grayscale frame once so the result can be reused."""
+    entropy, variance = entropy_variance_u8(np.ascontiguousarray(gray).ravel())
+    # The spread measure has always been the std dev, not the raw variance
+    return {
+        'entropy': entropy,
+        'variance': math.sqrt(max(variance, 0.0))
+    }
+
+def is_similar_to_previous(curr_metrics, prev_metrics, threshold=0.1):
     """Check if frame is too similar to previous frame."""
     if prev_metrics is None:
         return False
-        
-    curr_entropy = calculate_entropy(current_frame)
-    curr_variance = calculate_variance(current_frame)
     
-    entropy_diff = abs(curr_entropy - prev_metrics['entropy'])
-    variance_diff = abs(curr_variance - prev_metrics['variance'])
+    entropy_diff = abs(curr_metrics['entropy'] - prev_metrics['entropy'])
+    variance_diff = abs(curr_metrics['variance'] - prev_metrics['variance'])
     
     return entropy_diff < threshold and variance_diff < threshold
 
-def extract_frames(input_path, out_dir, step=1, resize=None, deduplicate=True):
-    """Extract frames from video with optional deduplication and resizing."""
+def dhash(gray):
+    """64-bit difference hash of a grayscale frame.
+    Shrinks it to 9x8 and records whether each pixel is brighter than its left neighbour."""
+    small = cv2.resize(gray, (9, 8), interpolation=cv2.INTER_AREA)
+    diff = small[:, 1:] > small[:, :-1]
+    return int(np.packbits(diff).view(np.uint64)[0])
+
+def is_similar_hash(curr_hash, prev_hash, hamming_thresh=5):
+    """Check if two frame hashes differ in fewer than hamming_thresh bits."""
+    if prev_hash is None:
+        return False
+    return (curr_hash ^ prev_hash).bit_count() < hamming_thresh
+
+def write_manifest(out_dir, frame_numbers, start_time, fps, image_format='png'):
+    """Write manifest.csv mapping each saved frame to its filename and timestamp.
+    Timestamps are worked out for all frames at once after extraction."""
+    frame_numbers = np.asarray(frame_numbers, dtype=np.int64)
+    offsets_us = np.round(frame_numbers * (1e6 / fps)).astype('timedelta64[us]')
+    timestamps = np.datetime_as_string(np.datetime64(start_time, 'us') + offsets_us)
+    
+    with open(Path(out_dir) / 'manifest.csv', 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(['frame_number', 'filename', 'timestamp'])
+        for number, timestamp in zip(frame_numbers.tolist(), timestamps):
+            writer.writerow([number, f"frame_{number:06d}.{image_format}", timestamp])
+
+def extract_frames(input_path, out_dir, step=1, resize=None, deduplicate=True,
+                   dedup_method='dhash', image_format='png'):
+    """Extract frames from video with optional deduplication and resizing.
+    dedup_method is 'dhash' (perceptual hash) or 'entropy' (entropy + variance).
+    image_format is 'png' (lossless) or 'jpg' (smaller, faster to encode)."""
+    if dedup_method not in ('dhash', 'entropy'):
+        raise ValueError(f"Unknown dedup method: {dedup_method}")
+    if image_format not in ('png', 'jpg'):
+        raise ValueError(f"Unknown image format: {image_format}")
+    use_entropy = dedup_method == 'entropy'
+    
     video = cv2.VideoCapture(input_path)
     if not video.isOpened():
         raise ValueError(f"Could not open video file: {input_path}")
@@ -47,44 +87,79 @@ def extract_frames(input_path, out_dir, step=1, resize=None, deduplicate=True):
     out_dir = Path(out_dir)
     out_dir.mkdir(parents=True, exist_ok=True)
     
+    # Encode settings for the chosen output format
+    if image_format == 'jpg':
+        write_params = [cv2.IMWRITE_JPEG_QUALITY, 92]
+    else:
+        write_params = [cv2.IMWRITE_PNG_COMPRESSION, 1]
+    
+    # Encoding happens on worker threads so decoding never waits on disk.
+    # The semaphore caps how many frames can be queued up in memory.
+    workers = max(2, (os.cpu_count() or 2) // 2)
+    pool = ThreadPoolExecutor(max_workers=workers)
+    pending = threading.BoundedSemaphore(workers * 2)
+    
+    def save_frame(path, image):
+        try:
+            cv2.imwrite(path, image, write_params)
+        finally:
+            pending.release()
+    
     # Process frames
     frame_number = 0
     saved_count = 0
+    saved_frames = []
     prev_metrics = None
+    if deduplicate and use_entropy:
+        warmup_metrics()
     
-    while True:
-        ret, frame = video.read()
-        if not ret:
-            break
-            
-        if frame_number % step == 0:
-            # Resize if specified
-            if resize:
-                width, height = map(int, resize.split('x'))
-                frame = cv2.resize(frame, (width, height))
-            
-            # Check for duplicates if enabled
-            if deduplicate and is_similar_to_previous(frame, prev_metrics):
-                frame_number += 1
-                continue
-            
-            # Calculate frame timestamp
-            timestamp = start_time + timedelta(seconds=frame_number/fps)
-            
-            # Save frame
-            filename = f"frame_{frame_number:06d}_{timestamp.strftime('%Y%m%d_%H%M%S_%f')}.png"
-            cv2.imwrite(str(out_dir / filename), frame)
-            saved_count += 1
-            
-            # Update metrics for next comparison
-            prev_metrics = {
-                'entropy': calculate_entropy(frame),
-                'variance': calculate_variance(frame)
-            }
-            
-        frame_number += 1
+    try:
+        while True:
+            # grab() only advances the stream; the BGR conversion in
+            # retrieve() is only paid for frames we actually keep
+            if not video.grab():
+                break
+                
+            if frame_number % step == 0:
+                ret, frame = video.retrieve()
+                if not ret:
+                    break
+                
+                # Resize if specified
+                if resize:
+                    width, height = map(int, resize.split('x'))
+                    frame = cv2.resize(frame, (width, height))
+                
+                # Check for duplicates if enabled
+                if deduplicate:
+                    gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+                    if use_entropy:
+                        curr_metrics = compute_metrics(gray)
+                        similar = is_similar_to_previous(curr_metrics, prev_metrics)
+                    else:
+                        curr_metrics = dhash(gray)
+                        similar = is_similar_hash(curr_metrics, prev_metrics)
+                    if similar:
+                        frame_number += 1
+                        continue
+                
+                # Save frame (retrieve() hands back a fresh array, so no copy needed)
+                filename = f"frame_{frame_number:06d}.{image_format}"
+                pending.acquire()
+                pool.submit(save_frame, str(out_dir / filename), frame)
+                saved_count += 1
+                saved_frames.append(frame_number)
+                
+                # Update metrics for next comparison
+                if deduplicate:
+                    prev_metrics = curr_metrics
+                
+            frame_number += 1
+    finally:
+        pool.shutdown(wait=True)
+        video.release()
         
-    video.release()
+    write_manifest(out_dir, saved_frames, start_time, fps, image_format)
     return frame_number, saved_count
 
 def main():
@@ -94,6 +169,10 @@ def main():
     parser.add_argument('--step', type=int, default=1, help='Extract every Nth frame')
     parser.add_argument('--resize', help='Resize frames to WxH (e.g., 640x480)')
     parser.add_argument('--no-deduplicate', action='store_true', help='Disable deduplication')
+    parser.add_argument('--dedup-method', choices=['dhash', 'entropy'], default='dhash',
+                        help='Frame similarity measure used for deduplication (default: dhash)')
+    parser.add_argument('--format', choices=['png', 'jpg'], default='png',
+                        help='Output image format (default: png)')
     
     args = parser.parse_args()
     
@@ -103,7 +182,9 @@ def main():
             args.out_dir,
             args.step,
             args.resize,
-            not args.no_deduplicate
+            not args.no_deduplicate,
+            args.dedup_method,
+            args.format
         )
         
         print(f"\nFrame Extraction Summary:")
@@ -10,17 +10,19 @@ import csv
 import logging
 import os
 import sys
+import time
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import Any, Dict, List, Optional, TextIO, Tuple
 
 import cv2
 import numpy as np
 import pandas as pd
 
-from src.detectors.classic_cv import detect_edges_contours
+from src.detectors.classic_cv import ClassicDetector
 from src.detectors.yolo import YOLOHazard
 from src.io.camera import VideoSource
+from src.io.video_writer import open_video_writer
 from src.slim1.ui import draw_bounding_boxes, draw_status_overlay, draw_servo_indicator
 
 # Configure logging
@@ -43,6 +45,7 @@ class HazardStateMachine:
         self.debounce_frames = debounce_frames
         self.hazard_count = 0
         self.current_state = "SAFE"
+        self._smoothed_angle = 0.0
         
     def update(self, detections: List[Dict]) -> Tuple[str, float]:
         """
@@ -54,7 +57,7 @@ class HazardStateMachine:
         Returns:
             Tuple of (state, servo_angle)
             - state: "SAFE" or "HAZARD"
-            - servo_angle: Angle for servo (-90 to 90, or 0 for centered)
+            - servo_angle: Smoothed angle for servo (-90 to 90, eases back to 0 with no detections)
         """
         if len(detections) > 0:
             self.hazard_count += 1
@@ -70,42 +73,130 @@ class HazardStateMachine:
         # Calculate servo angle based on detection position
         servo_angle = 0.0
         if len(detections) > 0:
-            # Use the first detection to determine servo angle
-            det = detections[0]
-            x_center = det.get('x', 0) + det.get('w', 0) / 2
+            # Aim at the area-weighted centre of all detections, so the
+            # servo doesn't jump around when detection order changes
+            boxes = np.fromiter(
+                ((d.get('x', 0), d.get('y', 0), d.get('w', 0), d.get('h', 0))
+                 for d in detections),
+                dtype=np.dtype((np.float32, 4)),
+                count=len(detections)
+            )
+            centers_x = boxes[:, 0] + boxes[:, 2] * 0.5
+            weights = boxes[:, 2] * boxes[:, 3]
+            if weights.sum() > 0:
+                x_center = float((centers_x * weights).sum() / weights.sum())
+            else:
+                x_center = float(centers_x.mean())
             # Map x_center to angle range (-90 to 90)
             servo_angle = (x_center / 640.0 * 180.0) - 90.0
             servo_angle = max(-90.0, min(90.0, servo_angle))
             
-        return self.current_state, servo_angle
+        # Low-pass filter to cut down on servo twitching
+        self._smoothed_angle = 0.7 * self._smoothed_angle + 0.3 * servo_angle
+            
+        return self.current_state, self._smoothed_angle
+
+def cuda_available() -> bool:
+    """Check whether PyTorch can see a CUDA GPU."""
+    try:
+        import torch
+        return torch.cuda.is_available()
+    except ImportError:
+        return False
+
+def configure_opencv(use_pi: bool = False) -> None:
+    """
+    Make sure OpenCV uses its SIMD kernels and a sensible thread pool.
+    
+    Args:
+        use_pi: Use all 4 Pi cores instead of leaving one free for the main loop
+    """
+    cv2.setUseOptimized(True)
+    num_threads = 4 if use_pi else max(1, (os.cpu_count() or 1) - 1)
+    cv2.setNumThreads(num_threads)
+    
+    build_info = cv2.getBuildInformation()
+    logger.debug(f"OpenCV build information:\n{build_info}")
+    
+    # Spot x86 wheels built without AVX2 kernels (ARM builds use NEON instead)
+    simd_lines = [line for line in build_info.splitlines()
+                  if 'Baseline:' in line or 'Dispatched code generation:' in line]
+    simd = ' '.join(simd_lines)
+    if 'SSE' in simd and 'AVX2' not in simd:
+        logger.warning("OpenCV was built without AVX2 kernels - expect slower image processing")
+    
+    logger.info(f"OpenCV {cv2.__version__}: optimized={cv2.useOptimized()}, "
+                f"threads={cv2.getNumThreads()}")
 
 def setup_output_video(source_fps: float, width: int, height: int, 
-                      output_path: str) -> Optional[cv2.VideoWriter]:
-    """Initialize video writer if recording is enabled."""
+                      output_path: str, use_pi: bool = False) -> Optional[Any]:
+    """Initialize video writer if recording is enabled.
+    Prefers a hardware H.264 encoder so recording doesn't eat detection CPU."""
     if not output_path:
         return None
         
     os.makedirs(os.path.dirname(output_path), exist_ok=True)
-    fourcc = cv2.VideoWriter_fourcc(*'mp4v')
-    return cv2.VideoWriter(
-        output_path,
-        fourcc,
-        source_fps,
-        (width, height)
-    )
+    return open_video_writer(output_path, source_fps, (width, height), use_pi=use_pi)
 
-def setup_event_log(output_dir: str) -> Tuple[str, csv.DictWriter]:
-    """Initialize CSV event logger."""
+# Flush the event log at least this often (frames), and on every state change
+LOG_FLUSH_FRAMES = 30
+# First line of an event log, followed by the wall-clock time of elapsed_ns == 0
+EVENT_LOG_START_PREFIX = "# start_time="
+
+def setup_event_log(output_dir: str) -> Tuple[str, TextIO, Any, int]:
+    """
+    Initialize CSV event logger.
+    
+    The file gets a 1 MiB buffer so per-frame rows don't each hit the disk;
+    the caller decides when to flush and must close the returned file.
+    Rows carry elapsed_ns (monotonic nanoseconds since start_mono).
+    The matching wall-clock time goes on the first line as a
+    "# start_time=..." comment and is flushed straight away, so
+    finalize_event_log can turn the rows into timestamps even if the bot
+    lost power before it got the chance.
+    
+    Returns:
+        Tuple of (log_path, csv_file, csv_writer, start_mono) - start_mono
+        is the time.monotonic_ns() value rows should be measured from
+    """
     os.makedirs(output_dir, exist_ok=True)
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
     log_path = os.path.join(output_dir, f"events_{timestamp}.csv")
     
-    fieldnames = ['timestamp', 'state', 'num_detections', 'servo_angle']
-    csv_file = open(log_path, 'w', newline='')
-    writer = csv.DictWriter(csv_file, fieldnames=fieldnames)
-    writer.writeheader()
+    fieldnames = ['elapsed_ns', 'state', 'num_detections', 'servo_angle']
+    csv_file = open(log_path, 'w', newline='', buffering=1 << 20)
+    start_wall = datetime.now()
+    start_mono = time.monotonic_ns()
+    csv_file.write(f"{EVENT_LOG_START_PREFIX}{start_wall.isoformat()}\n")
+    writer = csv.writer(csv_file)
+    writer.writerow(fieldnames)
+    csv_file.flush()
     
-    return log_path, writer
+    return log_path, csv_file, writer, start_mono
+
+def finalize_event_log(log_path: str) -> None:
+    """
+    Replace the elapsed_ns column with ISO timestamps in one vectorized pass.
+    Also works on a log left behind by a crash.
+    
+    Args:
+        log_path: CSV written by setup_event_log (already closed)
+    """
+    try:
+        with open(log_path) as f:
+            first_line = f.readline().strip()
+        if not first_line.startswith(EVENT_LOG_START_PREFIX):
+            raise ValueError(f"missing '{EVENT_LOG_START_PREFIX}' line")
+        start_time = datetime.fromisoformat(first_line[len(EVENT_LOG_START_PREFIX):])
+        events = pd.read_csv(log_path, skiprows=1)
+    except Exception as e:
+        logger.error(f"Could not read event log for timestamp conversion: {e}")
+        return
+        
+    elapsed = pd.to_timedelta(events.pop('elapsed_ns'), unit='ns')
+    timestamps = pd.Timestamp(start_time) + elapsed
+    events.insert(0, 'timestamp', timestamps.dt.strftime('%Y-%m-%dT%H:%M:%S.%f'))
+    events.to_csv(log_path, index=False)
 
 def main():
     """Main application entry point."""
@@ -115,15 +206,21 @@ def main():
     parser.add_argument("--detector", choices=["classic", "yolo"],
                       default="classic", help="Detection method to use")
     parser.add_argument("--yolo-weights", type=str,
-                      help="Path to YOLO weights file")
+                      help="Path to YOLO weights (.pt, .onnx, .engine or OpenVINO model folder)")
     parser.add_argument("--output", type=str,
                       help="Path for output video file")
     parser.add_argument("--record", action="store_true",
                       help="Record annotated video")
     parser.add_argument("--use-pi", action="store_true",
                       help="Use Raspberry Pi camera")
+    parser.add_argument("--device", choices=["cpu", "cuda"], default="cpu",
+                      help="Device for YOLO inference")
     parser.add_argument("--yolo-every", type=int, default=3,
                       help="Run YOLO detector every N frames")
+    parser.add_argument("--classic-downsample", type=int, default=2,
+                      help="Shrink frames by this factor before classic detection "
+                           "(1 = full size; 2 finds the same regions about 3x faster, "
+                           "3+ starts missing small ones)")
     
     args = parser.parse_args()
     
@@ -131,25 +228,31 @@ def main():
     if args.detector == "yolo" and not args.yolo_weights:
         parser.error("--yolo-weights is required when using YOLO detector")
     
+    configure_opencv(use_pi=args.use_pi)
+    
     # Initialize detector
     if args.detector == "yolo":
+        if args.device == "cuda" and not cuda_available():
+            logger.warning("CUDA requested but no CUDA-enabled PyTorch/GPU found - using CPU")
+            args.device = "cpu"
         try:
             detector = YOLOHazard(
                 weights_path=args.yolo_weights,
                 conf=0.35,
-                device="cpu"
+                device=args.device
             )
             detect_fn = detector.detect
         except Exception as e:
             logger.error(f"Failed to initialize YOLO detector: {e}")
             sys.exit(1)
     else:
-        detect_fn = detect_edges_contours
+        detector = ClassicDetector({'downsample': args.classic_downsample})
+        detect_fn = detector.detect
     
     # Initialize video source
     try:
         source = int(args.source) if args.source.isdigit() else args.source
-        video = VideoSource(source, use_picamera=args.use_pi)
+        video = VideoSource(source, use_picamera=args.use_pi, reuse_buffers=True)
         video.start()
     except Exception as e:
         logger.error(f"Failed to initialize video source: {e}")
@@ -164,14 +267,16 @@ def main():
         if not args.output:
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             args.output = f"output/video_{timestamp}.mp4"
-        writer = setup_output_video(30.0, 640, 480, args.output)
+        writer = setup_output_video(30.0, 640, 480, args.output, use_pi=args.use_pi)
     
     # Initialize event logging
-    log_path, csv_writer = setup_event_log("logs")
+    log_path, csv_file, csv_writer, start_mono = setup_event_log("logs")
     logger.info(f"Logging events to: {log_path}")
     
     # Main processing loop
     frame_count = 0
+    prev_state = None
+    last_detections = []  # Carried over on frames where YOLO is skipped
     try:
         while True:
             ok, frame = video.read()
@@ -183,9 +288,8 @@ def main():
             # Run detection
             if args.detector == "yolo":
                 if frame_count % args.yolo_every == 0:
-                    detections = detect_fn(frame)
-                else:
-                    detections = []
+                    last_detections = detect_fn(frame)
+                detections = last_detections
             else:
                 detections = detect_fn(frame)
             
@@ -207,12 +311,15 @@ def main():
                 writer.write(frame)
             
             # Log event
-            csv_writer.writerow({
-                'timestamp': datetime.now().isoformat(),
-                'state': state,
-                'num_detections': len(detections),
-                'servo_angle': servo_angle
-            })
+            csv_writer.writerow((
+                time.monotonic_ns() - start_mono,
+                state,
+                len(detections),
+                servo_angle
+            ))
+            if state != prev_state or frame_count % LOG_FLUSH_FRAMES == 0:
+                csv_file.flush()
+            prev_state = state
             
     except KeyboardInterrupt:
         logger.info("Interrupted by user")
@@ -221,6 +328,8 @@ def main():
         video.release()
         if writer:
             writer.release()
+        csv_file.close()
+        finalize_event_log(log_path)
         cv2.destroyAllWindows()
         logger.info("Cleanup complete")
 
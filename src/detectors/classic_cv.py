@@ -17,14 +17,176 @@ DEFAULT_PARAMS = {
     'min_line_length': 50, # Minimum length of line
     'max_line_gap': 10,    # Maximum gap between line segments
     'min_area': 800,      # Minimum area for hazard regions
+    'downsample': 1,      # Shrink factor applied before edge detection (contour path only)
 }
 
+# Blur/dilate kernel size at full resolution. A downsampled frame gets a
+# proportionally smaller one (see _kernel_size), otherwise a 5x5 blur on a
+# half-size frame acts like 10x10 and washes out most of the edges
+_KERNEL_SIZE = 5
+
+# Square structuring elements used to grow edges into regions, by size
+_DILATE_KERNELS = {k: cv2.getStructuringElement(cv2.MORPH_RECT, (k, k)) for k in (1, 3, 5)}
+
+def _kernel_size(ds: int) -> int:
+    """Odd blur/dilate kernel size that covers the same area after shrinking by ds."""
+    return max(1, (_KERNEL_SIZE // ds) | 1)
+
+# Solid blue/red colour planes for visualize_masks, cached per frame shape
+_OVERLAY_PLANES: Dict[Tuple[int, ...], Tuple[np.ndarray, np.ndarray]] = {}
+
+def _overlay_planes(shape: Tuple[int, ...]) -> Tuple[np.ndarray, np.ndarray]:
+    """Get (blue, red) full-frame colour planes for the given frame shape."""
+    planes = _OVERLAY_PLANES.get(shape)
+    if planes is None:
+        blue = np.zeros(shape, dtype=np.uint8)
+        blue[:, :, 0] = 255
+        red = np.zeros(shape, dtype=np.uint8)
+        red[:, :, 2] = 255
+        planes = _OVERLAY_PLANES[shape] = (blue, red)
+    return planes
+
+def _edge_maps(frame: np.ndarray, p: Dict[str, Any],
+               bufs: Optional[Dict[str, np.ndarray]] = None,
+               ds: int = 1) -> Tuple[np.ndarray, np.ndarray]:
+    """Run the shared grayscale -> blur -> Canny -> dilate chain once.
+    
+    Args:
+        frame: BGR input image
+        p: Merged detection parameters
+        bufs: Optional preallocated 'gray', 'blur', 'edges' and 'dilated'
+            buffers to write into instead of allocating new images
+        ds: Factor the frame was already shrunk by, to scale the kernels
+    
+    Returns:
+        Tuple of (edges, dilated_edges)
+    """
+    bufs = bufs or {}
+    gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY, dst=bufs.get('gray'))
+    k = _kernel_size(ds)
+    # INTER_AREA shrinking already averages, so at ds >= 3 the blur is skipped
+    blur = cv2.GaussianBlur(gray, (k, k), 0, dst=bufs.get('blur')) if k > 1 else gray
+    edges = cv2.Canny(blur, p['canny_low'], p['canny_high'], edges=bufs.get('edges'))
+    
+    # Dilate edges to get region around them
+    dilated = cv2.dilate(edges, _DILATE_KERNELS[k], dst=bufs.get('dilated'), iterations=1)
+    return edges, dilated
+
+def _boxes_from_mask(mask: np.ndarray, min_area: float,
+                     min_side: float = 10) -> List[Tuple[int, int, int, int]]:
+    """Find contours in a binary mask and keep the big enough ones as (x, y, w, h)."""
+    contours, _ = cv2.findContours(mask, cv2.RETR_EXTERNAL, 
+                                 cv2.CHAIN_APPROX_SIMPLE)
+    
+    boxes = []
+    for cnt in contours:
+        area = cv2.contourArea(cnt)
+        if area < min_area:
+            continue
+        x, y, w, h = cv2.boundingRect(cnt)
+        # Filter out extremely tall/narrow or tiny shapes
+        if w < min_side or h < min_side:
+            continue
+        boxes.append((x, y, w, h))
+    return boxes
+
+def _downsample(frame: np.ndarray, ds: int,
+                dst: Optional[np.ndarray] = None) -> np.ndarray:
+    """Shrink a frame by an integer factor (no-op for ds <= 1)."""
+    if ds <= 1:
+        return frame
+    h, w = frame.shape[:2]
+    return cv2.resize(frame, (w // ds, h // ds), dst=dst, interpolation=cv2.INTER_AREA)
+
+def _detections_from_edges(dilated: np.ndarray, p: Dict[str, Any], ds: int) -> List[Dict]:
+    """Turn a (possibly downsampled) dilated edge map into full-resolution detections."""
+    # Size limits are in full-resolution pixels, so shrink them to match the map
+    boxes = _boxes_from_mask(dilated, p['min_area'] / (ds * ds), min_side=10 / ds)
+    return [{'x': x * ds, 'y': y * ds, 'w': w * ds, 'h': h * ds}
+            for x, y, w, h in boxes]
+
+def detect_edges_contours(frame: np.ndarray,
+                          params: Optional[Dict[str, Any]] = None) -> List[Dict]:
+    """Detect candidate hazard regions from edge contours.
+    
+    This is the per-frame entry point used by the app. Runs Canny and dilate
+    once and skips the Hough line step entirely. Set params['downsample']
+    to 2 or more to run the whole pipeline on a smaller frame; boxes are
+    scaled back to full resolution.
+    
+    Args:
+        frame: BGR input image
+        params: Optional dictionary of parameters to override defaults
+        
+    Returns:
+        List of detections, each a dict with x, y, w, h (pixels) - same
+        layout as YOLOHazard.detect so the rest of the app doesn't care
+        which detector produced them.
+    """
+    p = DEFAULT_PARAMS.copy()
+    if params:
+        p.update(params)
+        
+    ds = max(1, int(p['downsample']))
+    _, dilated = _edge_maps(_downsample(frame, ds), p, ds=ds)
+    return _detections_from_edges(dilated, p, ds)
+
+class ClassicDetector:
+    """Edge/contour detector that keeps its working images between frames.
+    
+    Gives the same detections as detect_edges_contours, but the gray, blur,
+    edge and dilated images are allocated once per resolution and written
+    in place every frame instead of being reallocated.
+    
+    Example:
+        >>> detector = ClassicDetector({'min_area': 500})
+        >>> detections = detector.detect(frame)
+    """
+    
+    def __init__(self, params: Optional[Dict[str, Any]] = None):
+        """
+        Args:
+            params: Optional dictionary of parameters to override defaults
+        """
+        self.params = DEFAULT_PARAMS.copy()
+        if params:
+            self.params.update(params)
+        self._bufs: Dict[Tuple[int, int], Dict[str, np.ndarray]] = {}
+        self._small: Dict[Tuple[int, ...], np.ndarray] = {}
+        
+    def _get(self, shape: Tuple[int, int]) -> Dict[str, np.ndarray]:
+        """Get (allocating on first use) the working buffers for a frame size."""
+        bufs = self._bufs.get(shape)
+        if bufs is None:
+            bufs = {name: np.empty(shape, dtype=np.uint8)
+                    for name in ('gray', 'blur', 'edges', 'dilated')}
+            self._bufs[shape] = bufs
+        return bufs
+        
+    def detect(self, frame: np.ndarray) -> List[Dict]:
+        """Detect candidate hazard regions in a BGR frame.
+        
+        Returns:
+            List of detections, each a dict with x, y, w, h (pixels)
+        """
+        ds = max(1, int(self.params['downsample']))
+        if ds > 1:
+            # resize writes into the cached image when the size matches
+            small = _downsample(frame, ds, self._small.get(frame.shape))
+            self._small[frame.shape] = small
+        else:
+            small = frame
+        _, dilated = _edge_maps(small, self.params, self._get(small.shape[:2]), ds)
+        return _detections_from_edges(dilated, self.params, ds)
+
 def detect_hazards_classic(frame: np.ndarray, 
                          params: Optional[Dict[str, Any]] = None) -> Tuple[List[Tuple[int, int, int, int]], np.ndarray, np.ndarray]:
     """Detect potential hazards using classic computer vision techniques.
     
     Uses Canny edge detection and Hough line transform to identify power lines,
     then looks for significant regions that might represent hazards.
+    Shares its edge pass with detect_edges_contours; only the Hough step and
+    the masks are extra.
     
     Args:
         frame: BGR input image
@@ -55,12 +217,7 @@ def detect_hazards_classic(frame: np.ndarray,
     if params:
         p.update(params)
         
-    # Convert to grayscale and blur
-    gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-    blur = cv2.GaussianBlur(gray, (5, 5), 0)
-    
-    # Detect edges using Canny
-    edges = cv2.Canny(blur, p['canny_low'], p['canny_high'])
+    edges, dilated_edges = _edge_maps(frame, p)
     
     # Detect lines using Hough transform
     lines = cv2.HoughLinesP(edges, p['hough_rho'], p['hough_theta'],
@@ -78,28 +235,12 @@ def detect_hazards_classic(frame: np.ndarray,
             x1, y1, x2, y2 = line[0]
             cv2.line(line_mask, (x1, y1), (x2, y2), 255, 2)
     
-    # Dilate edges to get region around them
-    kernel = np.ones((5,5), np.uint8)
-    dilated_edges = cv2.dilate(edges, kernel, iterations=1)
-    
-    # Find regions that might be hazards (not part of power lines)
-    non_line = cv2.bitwise_xor(dilated_edges, line_mask)
-    
-    # Find contours in the non-line regions
-    contours, _ = cv2.findContours(non_line, cv2.RETR_EXTERNAL, 
-                                 cv2.CHAIN_APPROX_SIMPLE)
+    # Find regions that might be hazards (edges minus power line pixels).
+    # Written in place since dilated_edges isn't needed after this.
+    non_line = cv2.subtract(dilated_edges, line_mask, dst=dilated_edges)
     
     # Filter contours by area and convert to bounding boxes
-    boxes = []
-    for cnt in contours:
-        area = cv2.contourArea(cnt)
-        if area < p['min_area']:
-            continue
-        x, y, w, h = cv2.boundingRect(cnt)
-        # Filter out extremely tall/narrow or tiny shapes
-        if w < 10 or h < 10:
-            continue
-        boxes.append((x, y, w, h))
+    boxes = _boxes_from_mask(non_line, p['min_area'])
             
     return boxes, line_mask, non_line
 
@@ -122,21 +263,18 @@ def visualize_masks(frame: np.ndarray,
         >>> vis = visualize_masks(img, line_mask, non_line)
         >>> cv2.imshow('Visualization', vis)
     """
+    blue, red = _overlay_planes(frame.shape)
+    
     # Create copy of input frame
     vis = frame.copy()
     
-    # Add blue overlay for power lines
-    vis[line_mask > 0] = cv2.addWeighted(
-        vis[line_mask > 0], 0.7,
-        np.full_like(vis[line_mask > 0], [255, 0, 0]), 0.3,
-        0
-    )
+    # Add blue overlay for power lines: blend the whole frame, keep masked pixels
+    blended = cv2.addWeighted(vis, 0.7, blue, 0.3, 0)
+    cv2.copyTo(blended, line_mask, vis)
     
     # Add red overlay for potential hazard regions
-    vis[non_line > 0] = cv2.addWeighted(
-        vis[non_line > 0], 0.7,
-        np.full_like(vis[non_line > 0], [0, 0, 255]), 0.3,
-        0
-    )
+    cv2.addWeighted(vis, 0.7, red, 0.3, 0, dst=blended)
+    cv2.copyTo(blended, non_line, vis)
     
     return vis
+
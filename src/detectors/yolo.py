@@ -6,8 +6,10 @@ Much more reliable than classical CV, but needs a trained model.
 
 import logging
 import os
+import threading
+import time
 from pathlib import Path
-from typing import Union, List, Dict, Optional
+from typing import Union, List, Dict, Optional, Tuple
 
 import numpy as np
 from ultralytics import YOLO
@@ -16,38 +18,223 @@ from ultralytics import YOLO
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Loaded models shared between detectors, keyed by (weights_path, device), so
+# building a second detector on the same weights doesn't load them again
+_MODEL_CACHE: Dict[Tuple[str, str], YOLO] = {}
+_MODEL_CACHE_LOCK = threading.Lock()
+# One lock per cached model. Detectors sharing a model take turns calling it,
+# since an Ultralytics predictor (and its CUDA stream) isn't thread-safe
+_MODEL_LOCKS: Dict[Tuple[str, str], threading.Lock] = {}
+
 class YOLOHazard:
     """Wrapper for Ultralytics YOLO model with normalized detection interface."""
     
-    def __init__(self, weights_path: str, conf: float = 0.35, device: str = "cpu"):
+    def __init__(self, weights_path: str, conf: float = 0.35, device: str = "cpu",
+                 batch_size: int = 8, torch_compile: bool = True, warmup_iters: int = 3,
+                 half: bool = True, iou: float = 0.5, max_det: int = 20,
+                 classes: Optional[List[int]] = None, agnostic_nms: bool = True,
+                 frame_size: Tuple[int, int] = (640, 480)):
         """
         Initialize YOLO model for hazard detection.
         
         Args:
-            weights_path: Path to YOLO weights file (.pt)
+            weights_path: Path to YOLO weights - a .pt file, or an exported
+                model (.onnx, TensorRT .engine, or an OpenVINO folder/.xml)
             conf: Confidence threshold (0-1)
             device: Device to run inference on ('cpu' or 'cuda')
+            batch_size: Default number of frames per detect_batch call
+                (used by BatchAccumulator)
+            torch_compile: Run the network through torch.compile (CUDA only,
+                falls back to eager if it doesn't work)
+            warmup_iters: Dummy inferences to run at load so the first real
+                frame doesn't eat the cuDNN autotune / JIT cost (0 to skip)
+            half: Run in FP16 on CUDA GPUs with tensor cores (ignored on CPU)
+            iou: NMS IoU threshold
+            max_det: Max detections kept per frame
+            classes: Only keep these class IDs (None = all)
+            agnostic_nms: Run NMS across classes instead of per class
+            frame_size: (width, height) of the frames that will come in, so
+                warm-up runs at the same letterboxed shape as real frames
         """
         self.conf = conf
         self.device = device
+        self.iou = iou
+        self.max_det = max_det
+        self.classes = classes
+        self.agnostic_nms = agnostic_nms
+        self.batch_size = max(1, batch_size)
+        self.frame_size = frame_size
         self._frame_count = 0
         
-        # Validate weights path
-        weights_path = str(Path(weights_path).resolve())
-        if not os.path.exists(weights_path):
+        # Validate weights path (strict resolve does the existence check too)
+        try:
+            weights_path = str(Path(weights_path).resolve(strict=True))
+        except FileNotFoundError:
             raise FileNotFoundError(f"Weights file not found: {weights_path}")
+
+        # Ultralytics wants the OpenVINO export folder, not the .xml inside it
+        if weights_path.endswith(".xml"):
+            weights_path = os.path.dirname(weights_path)
+        self.backend = self._backend_for(weights_path)
             
-        try:
-            logger.info(f"Loading YOLO model from {weights_path} on {device}")
-            self.model = YOLO(weights_path)
-            self.model.to(device)
-        except Exception as e:
-            raise RuntimeError(f"Failed to load YOLO model: {str(e)}")
+        with _MODEL_CACHE_LOCK:
+            cache_key = (weights_path, str(device))
+            cached = cache_key in _MODEL_CACHE
+            if cached:
+                logger.info(f"Reusing loaded YOLO model {weights_path} on {device}")
+                self.model = _MODEL_CACHE[cache_key]
+            else:
+                try:
+                    logger.info(f"Loading YOLO model from {weights_path} on {device} ({self.backend})")
+                    self.model = YOLO(weights_path, task="detect")
+                    if self.backend == "pytorch":
+                        # Exported models are tied to their runtime and can't be moved
+                        self.model.to(device)
+                except Exception as e:
+                    raise RuntimeError(f"Failed to load YOLO model: {str(e)}")
+                _MODEL_CACHE[cache_key] = self.model
+                _MODEL_LOCKS[cache_key] = threading.Lock()
+            self._model_lock = _MODEL_LOCKS[cache_key]
+
+        self._half = half and self.backend == "pytorch" and self._fp16_supported(device)
+        if self._half:
+            logger.info("Running YOLO inference in FP16")
+
+        # Same predict settings for every call - built once here
+        self._predict_kwargs = dict(
+            conf=self.conf,
+            iou=self.iou,
+            max_det=self.max_det,
+            classes=self.classes,
+            agnostic_nms=self.agnostic_nms,
+            device=self.device,
+            half=self._half,
+            verbose=False,
+        )
+        self.model.overrides['verbose'] = False
+
+        imgsz = getattr(self.model, 'overrides', {}).get('imgsz') or 640
+        self.imgsz = max(imgsz) if isinstance(imgsz, (list, tuple)) else imgsz
+
+        if torch_compile and self.backend == "pytorch" and str(device).startswith("cuda"):
+            self._compile_model()
+
+        # A shared model has already been warmed up by whoever loaded it
+        if not cached:
+            self._warmup(warmup_iters)
             
         # Get class names if available
         self.class_names = self.model.names if hasattr(self.model, 'names') else {}
         logger.info(f"Model loaded successfully. Classes: {list(self.class_names.values())}")
 
+    @staticmethod
+    def _backend_for(weights_path: str) -> str:
+        """Work out which runtime a weights path needs from its suffix."""
+        if os.path.isdir(weights_path):
+            return "openvino"
+        return {
+            ".onnx": "onnxruntime",
+            ".engine": "tensorrt",
+        }.get(Path(weights_path).suffix.lower(), "pytorch")
+
+    @staticmethod
+    def _fp16_supported(device: str) -> bool:
+        """True if device is a CUDA GPU with tensor cores (compute capability 7+)."""
+        if not str(device).startswith("cuda"):
+            return False
+        try:
+            import torch
+            if not torch.cuda.is_available():
+                return False
+            index = torch.device(device).index or 0
+            return torch.cuda.get_device_capability(index)[0] >= 7
+        except Exception:
+            return False
+
+    def _compile_model(self, mode: str = "reduce-overhead") -> None:
+        """
+        Wrap the network the predictor actually runs in torch.compile to
+        fuse kernels. Needs torch 2.x. Any failure just leaves the model in
+        eager mode.
+
+        Ultralytics builds its predictor on the first call, fusing and
+        copying self.model.model into its own AutoBackend, so compiling
+        self.model.model itself would be thrown away. Instead one call is
+        made to get the predictor set up and its copy is compiled.
+
+        Args:
+            mode: torch.compile mode ('reduce-overhead' or 'max-autotune')
+        """
+        try:
+            import torch
+            if not hasattr(torch, "compile"):
+                logger.warning(f"torch {torch.__version__} has no torch.compile - running eager")
+                return
+            if getattr(self.model, "predictor", None) is None:
+                with self._model_lock:
+                    self.model(self._dummy_input(), **self._predict_kwargs)
+            backend = self.model.predictor.model
+            if hasattr(backend.model, "_orig_mod"):
+                return  # Already compiled (shared cached model)
+            # dynamic left at its default so a changing batch size from
+            # detect_batch gets marked dynamic instead of recompiling every time
+            backend.model = torch.compile(backend.model, mode=mode)
+            logger.info(f"Compiled YOLO model with torch.compile (mode={mode})")
+        except Exception as e:
+            logger.warning(f"torch.compile failed, running eager: {str(e)}")
+
+    def _dummy_input(self) -> np.ndarray:
+        """Blank frame the same size as the real ones."""
+        width, height = self.frame_size
+        return np.zeros((height, width, 3), dtype=np.uint8)
+
+    def _warmup(self, iters: int) -> None:
+        """
+        Push a few blank frames through the model so the slow first call
+        happens here instead of on the first camera frame. They go in at
+        frame_size, so cuDNN autotune and torch.compile see the letterboxed
+        shape real frames get.
+
+        Args:
+            iters: Number of dummy inferences to run
+        """
+        if iters <= 0:
+            return
+        dummy = self._dummy_input()
+        try:
+            start = time.perf_counter()
+            with self._model_lock:
+                for _ in range(iters):
+                    self.model(dummy, **self._predict_kwargs)
+            logger.info(f"YOLO warm-up done ({iters} runs, {time.perf_counter() - start:.2f}s)")
+        except Exception as e:
+            logger.warning(f"YOLO warm-up failed: {str(e)}")
+
+    def _parse_result(self, result) -> List[Dict]:
+        """Convert one Ultralytics result into our detection dicts."""
+        boxes = getattr(result, 'boxes', None)
+        if boxes is None or len(boxes) == 0:
+            return []
+        
+        # Pull every box off the device in one go (3 copies instead of 3 per box)
+        xyxy = boxes.xyxy.detach().cpu().numpy().astype(np.int32)
+        class_ids = boxes.cls.detach().cpu().numpy().astype(np.int32)
+        confs = boxes.conf.detach().cpu().numpy()
+        wh = xyxy[:, 2:] - xyxy[:, :2]
+        
+        return [
+            {
+                'x': int(x1),
+                'y': int(y1),
+                'w': int(w),
+                'h': int(h),
+                'conf': float(c),
+                'class_id': int(k),
+                'label': self.class_names.get(int(k), f"class_{int(k)}")
+            }
+            for (x1, y1), (w, h), c, k in zip(xyxy[:, :2], wh, confs, class_ids)
+        ]
+
     def detect(self, frame: Union[str, np.ndarray], every_n_frames: int = 1) -> List[Dict]:
         """
         Detect hazards in an image frame.
@@ -64,55 +251,138 @@ class YOLOHazard:
             - class_id: Class ID number
             - label: Class name if available
         """
-        # Skip frames based on counter
-        self._frame_count += 1
-        if every_n_frames > 1 and self._frame_count % every_n_frames != 0:
-            return []
+        # Skip frames based on counter (before any other work)
+        if every_n_frames > 1:
+            self._frame_count += 1
+            if every_n_frames & (every_n_frames - 1) == 0:
+                # Power of two - a bit mask does the job of %
+                if self._frame_count & (every_n_frames - 1):
+                    return []
+            elif self._frame_count % every_n_frames:
+                return []
             
         # Input validation
         if isinstance(frame, str):
-            if not os.path.exists(frame):
+            if not os.path.isfile(frame):
                 raise FileNotFoundError(f"Image file not found: {frame}")
         elif not isinstance(frame, np.ndarray):
             raise TypeError("Frame must be a numpy array or path to image file")
             
         try:
             # Run inference
-            results = self.model(frame, conf=self.conf, device=self.device)
+            with self._model_lock:
+                results = self.model(frame, **self._predict_kwargs)
             
-            # Process results
-            detections = []
-            if len(results) > 0 and hasattr(results[0], 'boxes'):
-                boxes = results[0].boxes
-                
-                # Convert boxes to normalized format
-                for box in boxes:
-                    # Get box coordinates (convert to xywh format)
-                    xyxy = box.xyxy[0].cpu().numpy()
-                    x1, y1, x2, y2 = map(int, xyxy)
-                    w = x2 - x1
-                    h = y2 - y1
-                    
-                    # Get class info
-                    class_id = int(box.cls[0])
-                    label = self.class_names.get(class_id, f"class_{class_id}")
-                    
-                    detections.append({
-                        'x': x1,
-                        'y': y1,
-                        'w': w,
-                        'h': h,
-                        'conf': float(box.conf[0]),
-                        'class_id': class_id,
-                        'label': label
-                    })
-                    
-            return detections
+            return self._parse_result(results[0]) if len(results) > 0 else []
             
         except Exception as e:
             logger.error(f"Error during detection: {str(e)}")
             return []
             
+    def predict(self, frame: Union[str, np.ndarray]) -> List[Dict]:
+        """
+        Same as detect, but in the corner-box format test_detection.py uses.
+        
+        Args:
+            frame: BGR numpy array or path to image file
+            
+        Returns:
+            List of detections, each a dict with:
+            - bbox: (x1, y1, x2, y2) in pixels
+            - score: Confidence score (0-1)
+            - label: Class name
+            - method: Always 'yolo'
+        """
+        return [
+            {
+                'bbox': (d['x'], d['y'], d['x'] + d['w'], d['y'] + d['h']),
+                'score': d['conf'],
+                'label': d['label'],
+                'method': 'yolo'
+            }
+            for d in self.detect(frame)
+        ]
+            
+    def detect_batch(self, frames: List[np.ndarray]) -> List[List[Dict]]:
+        """
+        Detect hazards in several frames with a single model call.
+        
+        Batching spreads the per-call overhead over all the frames and keeps
+        the GPU busier than one frame at a time.
+        
+        Args:
+            frames: List of BGR numpy arrays
+            
+        Returns:
+            One detection list per input frame, in the same order
+            (same dict layout as detect)
+        """
+        if not frames:
+            return []
+            
+        try:
+            with self._model_lock:
+                results = self.model(list(frames), **self._predict_kwargs)
+            return [self._parse_result(result) for result in results]
+            
+        except Exception as e:
+            logger.error(f"Error during batch detection: {str(e)}")
+            return [[] for _ in frames]
+            
     def __repr__(self) -> str:
         """String representation of the detector."""
-        return f"YOLOHazard(conf={self.conf}, device='{self.device}', classes={len(self.class_names)})"
+        return (f"YOLOHazard(conf={self.conf}, device='{self.device}', "
+                f"backend='{self.backend}', classes={len(self.class_names)})")
+
+# Older name for the same detector
+YOLODetector = YOLOHazard
+
+class BatchAccumulator:
+    """
+    Collects frames until there's a full batch, then runs them through
+    YOLOHazard.detect_batch in one go. A timeout stops a slow source from
+    holding frames back forever.
+    
+    Example:
+        >>> batcher = BatchAccumulator(detector, batch_size=8)
+        >>> while True:
+        ...     ok, frame = video.read()
+        ...     results = batcher.add(frame)
+        ...     if results is not None:
+        ...         handle(results)  # one detection list per buffered frame
+    """
+    
+    def __init__(self, detector: YOLOHazard, batch_size: Optional[int] = None,
+                 timeout: float = 0.1):
+        """
+        Args:
+            detector: Detector used to run the batches
+            batch_size: Frames per batch (default: detector.batch_size)
+            timeout: Max seconds the oldest buffered frame may wait
+        """
+        self.detector = detector
+        self.batch_size = max(1, batch_size or detector.batch_size)
+        self.timeout = timeout
+        self._frames: List[np.ndarray] = []
+        self._first_ts = 0.0
+        
+    def add(self, frame: np.ndarray) -> Optional[List[List[Dict]]]:
+        """
+        Buffer a frame, running the batch once it's full or has timed out.
+        
+        Returns:
+            Detections for every buffered frame when a batch ran, else None
+        """
+        if not self._frames:
+            self._first_ts = time.monotonic()
+        self._frames.append(frame)
+        
+        if (len(self._frames) >= self.batch_size or
+                time.monotonic() - self._first_ts >= self.timeout):
+            return self.flush()
+        return None
+        
+    def flush(self) -> List[List[Dict]]:
+        """Run whatever is buffered right now (e.g. at end of stream)."""
+        frames, self._frames = self._frames, []
+        return self.detector.detect_batch(frames)
@@ -5,6 +5,8 @@ while being robust enough for real deployments.
 """
 
 import logging
+import threading
+import time
 from typing import Union, Tuple, Optional
 import cv2
 import numpy as np
@@ -29,10 +31,16 @@ class VideoSource:
     """
     Unified video source interface with fallback options.
     Supports OpenCV VideoCapture and Raspberry Pi Camera (picamera2).
+    
+    Live cameras are read on a background thread that always keeps the
+    newest frame, so read() doesn't sit waiting on the camera while the
+    detector is busy (stale frames just get dropped). Video files are read
+    in order on the caller's thread so no frames are skipped.
     """
     
     def __init__(self, source: Union[int, str], use_picamera: bool = False, 
-                 width: int = 640, height: int = 480):
+                 width: int = 640, height: int = 480, threaded: Optional[bool] = None,
+                 reuse_buffers: bool = False):
         """
         Initialize video source with specified parameters.
         
@@ -41,6 +49,11 @@ class VideoSource:
             use_picamera: Try to use Raspberry Pi camera if True
             width: Desired frame width
             height: Desired frame height
+            threaded: Capture on a background thread (default: only for
+                live cameras, never for video files)
+            reuse_buffers: Decode OpenCV frames into preallocated arrays
+                instead of a fresh one per frame. A frame returned by read()
+                is then only valid until the next read() call.
         """
         self.source = source
         self.width = width
@@ -48,6 +61,17 @@ class VideoSource:
         self.capture = None
         self._picam = None
         self._is_running = False
+        self._threaded = threaded
+        self._thread = None
+        self._lock = threading.Lock()
+        self._new_frame = threading.Event()
+        self._latest_ok = False
+        self._reuse_buffers = reuse_buffers
+        # Triple buffer: the capture thread writes one, one sits in the
+        # latest-frame slot and one is out with the caller. Inline reads
+        # only use the first. Allocated lazily from the first frame.
+        self._bufs = [None, None, None]
+        self._write_idx, self._slot_idx, self._reader_idx = 0, 1, 2
         
         # Try picamera2 if requested and available on Raspberry Pi
         if use_picamera and IS_RASPBERRY_PI and PICAMERA_AVAILABLE:
@@ -55,9 +79,10 @@ class VideoSource:
             try:
                 self._picam = Picamera2()
                 
-                # Configure camera
+                # Configure camera. libcamera names formats by word order, so
+                # "RGB888" lands in memory as B,G,R - exactly what OpenCV wants
                 config = self._picam.create_preview_configuration(
-                    main={"size": (width, height)},
+                    main={"size": (width, height), "format": "RGB888"},
                     buffer_count=2  # Double buffering for smoother capture
                 )
                 self._picam.configure(config)
@@ -80,6 +105,8 @@ class VideoSource:
             if isinstance(source, int):
                 self.capture.set(cv2.CAP_PROP_FRAME_WIDTH, width)
                 self.capture.set(cv2.CAP_PROP_FRAME_HEIGHT, height)
+                # Don't let the driver queue up old frames behind our back
+                self.capture.set(cv2.CAP_PROP_BUFFERSIZE, 1)
                 
             if not self.capture.isOpened():
                 raise RuntimeError("Failed to open video source")
@@ -101,33 +128,42 @@ class VideoSource:
                 raise RuntimeError(f"Failed to start Raspberry Pi Camera: {str(e)}")
         
         self._is_running = True
-        logger.info("Video stream started")
+        
+        if self._threaded is None:
+            self._threaded = self._picam is not None or isinstance(self.source, int)
+        if self._threaded:
+            self._new_frame.clear()
+            self._thread = threading.Thread(target=self._capture_loop, daemon=True)
+            self._thread.start()
+            
+        logger.info(f"Video stream started ({'background' if self._threaded else 'inline'} capture)")
 
-    def read(self) -> Tuple[bool, Optional[np.ndarray]]:
+    def _grab_frame(self, idx: int = 0) -> Tuple[bool, Optional[np.ndarray]]:
         """
-        Read a frame from the video source.
+        Pull one frame straight from the camera/file.
         
-        Returns:
-            Tuple of (success, frame)
-            - success: True if frame was successfully read
-            - frame: BGR numpy array or None if read failed
+        Args:
+            idx: Which preallocated buffer to decode into (if reuse_buffers)
         """
-        if not self._is_running:
-            logger.warning("Attempting to read from stopped video source")
-            return False, None
-            
         try:
             if self._picam:
-                # Get frame from Raspberry Pi Camera
+                # Get frame from Raspberry Pi Camera (already BGR, see __init__)
                 frame = self._picam.capture_array()
-                # Convert to BGR if needed (picamera2 returns RGB)
-                if frame is not None and frame.ndim == 3:
-                    frame = cv2.cvtColor(frame, cv2.COLOR_RGB2BGR)
-                return True, frame
+                if self._reuse_buffers:
+                    # picamera2 always hands back a new array - park it in
+                    # the slot ourselves, the capture loop won't
+                    self._bufs[idx] = frame
+                return frame is not None, frame
                 
             elif self.capture:
                 # Get frame from OpenCV
-                ret, frame = self.capture.read()
+                if not self._reuse_buffers:
+                    return self.capture.read()
+                # OpenCV decodes straight into the buffer when shape and dtype
+                # match, otherwise it allocates and we keep that one
+                ret, frame = self.capture.read(self._bufs[idx])
+                if ret:
+                    self._bufs[idx] = frame
                 return ret, frame
                 
         except Exception as e:
@@ -135,10 +171,57 @@ class VideoSource:
         
         return False, None
 
+    def _capture_loop(self) -> None:
+        """Background thread: keep overwriting the single latest-frame slot."""
+        while self._is_running:
+            ret, frame = self._grab_frame(self._write_idx)
+            with self._lock:
+                if not self._reuse_buffers:
+                    self._bufs[self._write_idx] = frame
+                self._latest_ok = ret
+                self._write_idx, self._slot_idx = self._slot_idx, self._write_idx
+                # Set under the lock, together with the swap. Set after it,
+                # a read() could take this frame and clear the event first,
+                # and the late set() would wake the next read() on the old slot
+                self._new_frame.set()
+            if not ret:
+                # Camera hiccup - don't spin flat out while it recovers
+                time.sleep(0.01)
+
+    def read(self) -> Tuple[bool, Optional[np.ndarray]]:
+        """
+        Read a frame from the video source.
+        
+        Returns:
+            Tuple of (success, frame)
+            - success: True if frame was successfully read
+            - frame: BGR numpy array or None if read failed
+        """
+        if not self._is_running:
+            logger.warning("Attempting to read from stopped video source")
+            return False, None
+            
+        if not self._threaded:
+            return self._grab_frame()
+            
+        # Returns at once if a frame came in since the last read, otherwise
+        # waits for the next one so the same frame isn't handed out twice
+        if not self._new_frame.wait(timeout=1.0):
+            logger.warning("Timed out waiting for a camera frame")
+            return False, None
+        with self._lock:
+            self._new_frame.clear()
+            self._reader_idx, self._slot_idx = self._slot_idx, self._reader_idx
+            return self._latest_ok, self._bufs[self._reader_idx]
+
     def release(self) -> None:
         """Release the video source and free resources."""
         self._is_running = False
         
+        if self._thread is not None:
+            self._thread.join(timeout=2.0)
+            self._thread = None
+        
         if self._picam:
             try:
                 self._picam.stop()
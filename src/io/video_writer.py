@@ -0,0 +1,161 @@
+"""
+Video output handler that tries to get the encoding off the CPU.
+On a Pi it pipes frames to ffmpeg's V4L2 M2M hardware H.264 encoder; elsewhere
+it asks OpenCV's FFmpeg backend for any hardware acceleration it can find.
+Falls back to plain software mp4v if none of that works.
+"""
+
+import logging
+import shutil
+import subprocess
+from typing import Tuple, Union
+
+import cv2
+import numpy as np
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+class FFmpegPipeWriter:
+    """
+    Streams raw BGR frames into an ffmpeg subprocess.
+    Has the same write/release/isOpened methods the app uses on cv2.VideoWriter.
+    """
+
+    def __init__(self, output_path: str, fps: float, size: Tuple[int, int],
+                 codec: str = "h264_v4l2m2m", bitrate: str = "4M"):
+        """
+        Start the ffmpeg encoder process.
+
+        Args:
+            output_path: Path for the output .mp4 file
+            fps: Frames per second of the stream
+            size: Frame size as (width, height)
+            codec: ffmpeg video encoder to use
+            bitrate: Target bitrate (hardware encoders need one set explicitly)
+        """
+        width, height = size
+        self.output_path = output_path
+        cmd = [
+            "ffmpeg", "-loglevel", "error", "-y",
+            "-f", "rawvideo", "-pix_fmt", "bgr24",
+            "-s", f"{width}x{height}", "-r", str(fps),
+            "-i", "-",
+            "-c:v", codec, "-b:v", bitrate, "-pix_fmt", "yuv420p",
+            "-f", "mp4", output_path,
+        ]
+        self._broken = False
+        self._proc = subprocess.Popen(cmd, stdin=subprocess.PIPE)
+
+    @staticmethod
+    def encoder_works(codec: str = "h264_v4l2m2m", size: Tuple[int, int] = (640, 480),
+                      timeout: float = 10.0) -> bool:
+        """
+        Encode one test frame to check the encoder actually runs here.
+        ffmpeg only opens the encoder once the first frame arrives, so a
+        missing one (e.g. the Pi 5 has no H.264 block) wouldn't show up
+        until recording had already started.
+
+        Args:
+            codec: ffmpeg video encoder to try
+            size: Frame size as (width, height)
+            timeout: Seconds to give ffmpeg before giving up
+
+        Returns:
+            True if ffmpeg encoded the frame without errors
+        """
+        width, height = size
+        cmd = [
+            "ffmpeg", "-loglevel", "error", "-hide_banner",
+            "-f", "lavfi", "-i", f"color=c=black:s={width}x{height}",
+            "-frames:v", "1", "-c:v", codec, "-pix_fmt", "yuv420p",
+            "-f", "null", "-",
+        ]
+        try:
+            probe = subprocess.run(cmd, stdin=subprocess.DEVNULL,
+                                   stdout=subprocess.DEVNULL, stderr=subprocess.PIPE,
+                                   timeout=timeout)
+        except (OSError, subprocess.TimeoutExpired) as e:
+            logger.warning(f"ffmpeg {codec} probe failed: {str(e)}")
+            return False
+        if probe.returncode != 0:
+            logger.warning(f"ffmpeg {codec} encoder not usable: "
+                           f"{probe.stderr.decode(errors='replace').strip()}")
+            return False
+        return True
+
+    def isOpened(self) -> bool:
+        """True while the ffmpeg process is alive and still taking frames."""
+        return not self._broken and self._proc.poll() is None
+
+    def write(self, frame: np.ndarray) -> None:
+        """Send one BGR frame to the encoder."""
+        if self._broken:
+            return
+        try:
+            self._proc.stdin.write(np.ascontiguousarray(frame).data)
+        except (BrokenPipeError, ValueError) as e:
+            # Say it once and drop the rest, not an error line per frame
+            self._broken = True
+            logger.error(f"ffmpeg encoder stopped accepting frames, recording stopped: {str(e)}")
+
+    def release(self) -> None:
+        """Close the pipe and wait for ffmpeg to finish the file."""
+        try:
+            self._proc.stdin.close()
+        except Exception:
+            pass
+        self._proc.wait()
+
+    def __repr__(self) -> str:
+        """String representation."""
+        status = "running" if self.isOpened() else "stopped"
+        return f"FFmpegPipeWriter({self.output_path}, {status})"
+
+def open_video_writer(output_path: str, fps: float, size: Tuple[int, int],
+                      use_pi: bool = False) -> Union[cv2.VideoWriter, FFmpegPipeWriter]:
+    """
+    Open the fastest video writer available on this machine.
+
+    Tries, in order:
+    1. ffmpeg with the V4L2 M2M hardware encoder (only when use_pi is set
+       and a test frame encodes)
+    2. OpenCV's FFmpeg backend with hardware-accelerated H.264
+    3. Software mp4v (the old default)
+
+    Args:
+        output_path: Path for the output video file
+        fps: Frames per second
+        size: Frame size as (width, height)
+        use_pi: Try the Raspberry Pi hardware encoder first
+
+    Returns:
+        An opened writer with write() and release()
+    """
+    if use_pi and shutil.which("ffmpeg") and FFmpegPipeWriter.encoder_works(size=size):
+        try:
+            writer = FFmpegPipeWriter(output_path, fps, size)
+            if writer.isOpened():
+                logger.info("Recording with ffmpeg h264_v4l2m2m hardware encoder")
+                return writer
+        except Exception as e:
+            logger.warning(f"ffmpeg hardware encoder unavailable: {str(e)}")
+
+    try:
+        writer = cv2.VideoWriter(
+            output_path,
+            cv2.CAP_FFMPEG,
+            cv2.VideoWriter_fourcc(*'avc1'),
+            fps,
+            size,
+            params=[cv2.VIDEOWRITER_PROP_HW_ACCELERATION, cv2.VIDEO_ACCELERATION_ANY]
+        )
+        if writer.isOpened():
+            logger.info("Recording with OpenCV FFmpeg H.264 (hardware acceleration if available)")
+            return writer
+    except Exception as e:
+        logger.warning(f"OpenCV hardware-accelerated writer unavailable: {str(e)}")
+
+    logger.info("Recording with software mp4v encoder")
+    return cv2.VideoWriter(output_path, cv2.VideoWriter_fourcc(*'mp4v'), fps, size)
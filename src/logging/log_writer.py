@@ -1,15 +1,24 @@
 import csv
 import json
+import time
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Optional, Union, Tuple
+from typing import Dict, Iterator, Optional, Union, Tuple
 
 class LogWriter:
     """
-    Keeps track of everything that happens in a CSV file.
+    Keeps track of everything that happens in a log file.
     Records when stuff was found, what state we're in, etc.
     Makes it way easier to figure out what went wrong later.
     Tries not to choke if the file gets locked or disk fills up.
+    
+    Events go to a JSON Lines file next to the CSV path (one JSON object per
+    line, append-only), so a new extra field never means rewriting the whole
+    log. Call export_csv() to get the spreadsheet-friendly CSV.
+    
+    The file stays open and writes are buffered; they hit the disk every
+    FLUSH_EVERY events or FLUSH_INTERVAL seconds, whichever comes first.
+    Call close() (or use it as a context manager) when you're done.
     """
     
     # Define standard columns that will always be present
@@ -23,48 +32,23 @@ class LogWriter:
         'angle',
     ]
     
+    FLUSH_EVERY = 64       # events
+    FLUSH_INTERVAL = 1.0   # seconds
+    
     def __init__(self, csv_path: Union[str, Path]):
         """
         Initialize the log writer.
         
         Args:
-            csv_path: Path to the CSV file
+            csv_path: Path of the CSV export. Events are stored in the same
+                place with a .jsonl suffix.
         """
         self.csv_path = Path(csv_path)
-        self.current_columns = self.STANDARD_COLUMNS.copy()
-        self._ensure_csv_exists()
-        
-    def _ensure_csv_exists(self):
-        """Create CSV file with headers if it doesn't exist."""
-        if not self.csv_path.exists():
-            self.csv_path.parent.mkdir(parents=True, exist_ok=True)
-            with open(self.csv_path, 'w', newline='') as f:
-                writer = csv.writer(f)
-                writer.writerow(self.current_columns)
-                
-    def _update_columns(self, extra: Dict) -> List[str]:
-        """
-        Update columns list based on extra fields.
-        Returns complete list of columns.
-        """
-        new_columns = set(extra.keys()) - set(self.current_columns)
-        if new_columns:
-            # Read existing data
-            rows = []
-            with open(self.csv_path, 'r', newline='') as f:
-                reader = csv.DictReader(f)
-                rows = list(reader)
-                
-            # Update columns list
-            self.current_columns.extend(sorted(new_columns))
-            
-            # Rewrite file with new headers and data
-            with open(self.csv_path, 'w', newline='') as f:
-                writer = csv.DictWriter(f, fieldnames=self.current_columns)
-                writer.writeheader()
-                writer.writerows(rows)
-                
-        return self.current_columns
+        self.jsonl_path = self.csv_path.with_suffix('.jsonl')
+        self.jsonl_path.parent.mkdir(parents=True, exist_ok=True)
+        self._fh = open(self.jsonl_path, 'a', buffering=1 << 16)
+        self._pending = 0
+        self._last_flush = time.monotonic()
         
     def write_event(self, 
                     timestamp: Optional[datetime] = None,
@@ -89,32 +73,102 @@ class LogWriter:
         row_data = {
             'timestamp': timestamp.isoformat(),
             'state': state,
-            'bbox_x': bbox[0] if bbox else '',
-            'bbox_y': bbox[1] if bbox else '',
-            'bbox_width': bbox[2] if bbox else '',
-            'bbox_height': bbox[3] if bbox else '',
-            'angle': angle if angle is not None else '',
+            'bbox_x': bbox[0] if bbox else None,
+            'bbox_y': bbox[1] if bbox else None,
+            'bbox_width': bbox[2] if bbox else None,
+            'bbox_height': bbox[3] if bbox else None,
+            'angle': angle,
         }
         
-        # Add extra fields
+        # Add extra fields (nested dicts/lists are stored as-is)
         if extra:
-            # Convert any complex objects to JSON strings
-            for key, value in extra.items():
-                if isinstance(value, (dict, list)):
-                    extra[key] = json.dumps(value)
             row_data.update(extra)
             
-        # Ensure columns are up to date
-        columns = self._update_columns(extra or {})
-        
-        # Write row safely
+        # Append one line - no matter what columns show up, nothing gets rewritten
         try:
-            with open(self.csv_path, 'a', newline='') as f:
-                writer = csv.DictWriter(f, fieldnames=columns)
-                writer.writerow(row_data)
+            self._fh.write(json.dumps(row_data, default=str) + '\n')
+            self._pending += 1
+            if (self._pending >= self.FLUSH_EVERY
+                    or time.monotonic() - self._last_flush > self.FLUSH_INTERVAL):
+                self.flush()
         except Exception as e:
             print(f"Error writing to log: {str(e)}")
             
+    def flush(self) -> None:
+        """Push any buffered events out to the file."""
+        if self._fh.closed:
+            return
+        self._fh.flush()
+        self._pending = 0
+        self._last_flush = time.monotonic()
+        
+    def close(self) -> None:
+        """Flush and close the log file."""
+        if not self._fh.closed:
+            self.flush()
+            self._fh.close()
+            
+    def export_csv(self, csv_path: Optional[Union[str, Path]] = None) -> Path:
+        """
+        Turn the JSON Lines log into a CSV file.
+        Columns are the standard ones followed by every extra field that
+        was ever logged, in the order they first showed up.
+        
+        Args:
+            csv_path: Where to write the CSV (default: the path given at init)
+            
+        Returns:
+            Path of the written CSV file
+        """
+        csv_path = Path(csv_path) if csv_path else self.csv_path
+        self.flush()
+        
+        # First pass: collect the union of all keys
+        columns = self.STANDARD_COLUMNS.copy()
+        seen = set(columns)
+        for row in self._read_rows():
+            for key in row:
+                if key not in seen:
+                    seen.add(key)
+                    columns.append(key)
+                    
+        # Second pass: stream the rows out
+        csv_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(csv_path, 'w', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=columns, restval='')
+            writer.writeheader()
+            for row in self._read_rows():
+                writer.writerow({
+                    key: json.dumps(value) if isinstance(value, (dict, list))
+                    else '' if value is None else value
+                    for key, value in row.items()
+                })
+                
+        return csv_path
+        
+    def _read_rows(self) -> Iterator[Dict]:
+        """Yield the logged events one dict at a time."""
+        if not self.jsonl_path.exists():
+            return
+        with open(self.jsonl_path, 'r') as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+            
     def get_filepath(self) -> Path:
-        """Get the current log file path."""
-        return self.csv_path
+        """Get the current log file path (the .jsonl events file)."""
+        return self.jsonl_path
+        
+    def __enter__(self) -> 'LogWriter':
+        """Context manager entry."""
+        return self
+        
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        """Context manager exit."""
+        self.close()
+        
+    def __del__(self):
+        """Don't lose buffered events if close() was never called."""
+        fh = getattr(self, '_fh', None)
+        if fh is not None and not fh.closed:
+            fh.close()
@@ -0,0 +1,74 @@
+"""
+Fast frame metrics for the frame extractor.
+Walks a grayscale frame once and gets both the histogram entropy and the
+pixel variance out of it. Uses Numba if it's installed, plain NumPy if not.
+"""
+
+import logging
+import math
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Try to import numba, but don't raise error if not available
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+    logger.info("numba not available - using NumPy frame metrics")
+
+
+def _entropy_variance_numpy(buf: np.ndarray):
+    """NumPy version of entropy_variance_u8 for systems without Numba."""
+    counts = np.bincount(buf, minlength=256)
+    probs = counts[counts > 0].astype(np.float64)
+    probs /= probs.sum()
+    entropy = float(-(probs * np.log2(probs)).sum())
+    values = np.arange(256, dtype=np.float64)
+    mean = float((counts * values).sum()) / buf.size
+    variance = float((counts * values * values).sum()) / buf.size - mean * mean
+    return entropy, variance
+
+
+if NUMBA_AVAILABLE:
+    @njit(cache=True, fastmath=True, boundscheck=False)
+    def _entropy_variance_numba(buf):
+        """Get (entropy, variance) of a flat uint8 buffer in a single pass.
+
+        Args:
+            buf: 1-D uint8 array, e.g. gray.ravel()
+
+        Returns:
+            Tuple of (entropy in bits, pixel variance)
+        """
+        hist = np.zeros(256, np.int64)
+        s = 0.0
+        ss = 0.0
+        n = buf.size
+        for i in range(n):
+            v = buf[i]
+            hist[v] += 1
+            fv = float(v)
+            s += fv
+            ss += fv * fv
+
+        mean = s / n
+        variance = ss / n - mean * mean
+
+        entropy = 0.0
+        for b in range(256):
+            if hist[b] > 0:
+                p = hist[b] / n
+                entropy -= p * math.log2(p)
+        return entropy, variance
+
+    entropy_variance_u8 = _entropy_variance_numba
+else:
+    entropy_variance_u8 = _entropy_variance_numpy
+
+
+def warmup() -> None:
+    """Compile the kernel up front so the first real frame doesn't pay for it."""
+    entropy_variance_u8(np.zeros(1, np.uint8))
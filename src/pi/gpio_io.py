@@ -12,9 +12,12 @@ Been there, fried that. Just use a proper power supply.
 """
 
 import logging
+import threading
 from typing import Optional
 import time
 
+import numpy as np
+
 # Setup logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -27,9 +30,15 @@ SERVO_PIN = 13  # GPIO13
 SERVO_FREQ = 50  # 50Hz PWM frequency
 DUTY_MIN = 2.5  # Duty cycle for 0 degrees
 DUTY_MAX = 12.5 # Duty cycle for 180 degrees
+DUTY_PER_DEG = (DUTY_MAX - DUTY_MIN) / 180.0
+SERVO_MIN_INTERVAL = 1.0 / SERVO_FREQ  # No point updating faster than one PWM period
 
 class GPIOSimulator:
-    """Simulated GPIO for development on non-Pi systems."""
+    """Simulated GPIO for development on non-Pi systems.
+    
+    Pin and PWM changes are logged at DEBUG with lazy % args, so the per-frame
+    LED/servo calls don't pay for string formatting unless you ask for it.
+    """
     
     def __init__(self):
         self.pins = {}
@@ -38,11 +47,11 @@ class GPIOSimulator:
         
     def setup(self, pin: int, mode: str) -> None:
         self.pins[pin] = 0
-        logger.info(f"Setup PIN{pin} as {mode}")
+        logger.debug("Setup PIN%s as %s", pin, mode)
         
     def output(self, pin: int, state: int) -> None:
         self.pins[pin] = state
-        logger.info(f"PIN{pin} set to {state}")
+        logger.debug("PIN%s set to %s", pin, state)
         
     def PWM(self, pin: int, freq: int) -> 'PWMSimulator':
         self.pwm[pin] = PWMSimulator(pin, freq)
@@ -60,18 +69,18 @@ class PWMSimulator:
         self.pin = pin
         self.freq = freq
         self.duty = 0
-        logger.info(f"PWM on PIN{pin} at {freq}Hz")
+        logger.debug("PWM on PIN%s at %sHz", pin, freq)
         
     def start(self, duty: float) -> None:
         self.duty = duty
-        logger.info(f"PWM PIN{self.pin} started at {duty}% duty cycle")
+        logger.debug("PWM PIN%s started at %s%% duty cycle", self.pin, duty)
         
     def ChangeDutyCycle(self, duty: float) -> None:
         self.duty = duty
-        logger.info(f"PWM PIN{self.pin} duty cycle changed to {duty}%")
+        logger.debug("PWM PIN%s duty cycle changed to %s%%", self.pin, duty)
         
     def stop(self) -> None:
-        logger.info(f"PWM PIN{self.pin} stopped")
+        logger.debug("PWM PIN%s stopped", self.pin)
 
 # Try to import RPi.GPIO, fallback to simulator if not available
 try:
@@ -86,6 +95,13 @@ except ImportError:
 # Global PWM object for servo
 servo_pwm: Optional[PWMSimulator] = None
 
+# Servo rate limiting - commands that come in too fast get coalesced and
+# the latest one is applied once the PWM period has passed
+_servo_lock = threading.Lock()
+_last_servo_cmd_ts = 0.0
+_pending_angle: Optional[float] = None
+_servo_timer: Optional[threading.Timer] = None
+
 def angle_to_duty(angle_deg: float) -> float:
     """Convert servo angle to PWM duty cycle.
     
@@ -98,7 +114,24 @@ def angle_to_duty(angle_deg: float) -> float:
     # Clamp angle to valid range
     angle_deg = max(0, min(180, angle_deg))
     # Linear interpolation between duty cycle limits
-    return DUTY_MIN + (angle_deg / 180.0) * (DUTY_MAX - DUTY_MIN)
+    return DUTY_MIN + angle_deg * DUTY_PER_DEG
+
+def angle_to_duty_batch(angles_deg: np.ndarray, out: Optional[np.ndarray] = None) -> np.ndarray:
+    """Convert a whole array of servo angles to duty cycles (e.g. a planned sweep).
+    
+    Args:
+        angles_deg: Angles in degrees (clamped to 0-180)
+        out: Float array to write into (can be angles_deg itself for in-place)
+        
+    Returns:
+        Array of PWM duty cycles (2.5-12.5%)
+    """
+    if out is None:
+        out = np.empty(np.shape(angles_deg), dtype=np.float64)
+    np.clip(angles_deg, 0, 180, out=out)
+    out *= DUTY_PER_DEG
+    out += DUTY_MIN
+    return out
 
 def setup_gpio() -> None:
     """Initialize GPIO pins for LED and servo control."""
@@ -136,14 +169,45 @@ def set_servo_angle(angle_deg: float) -> None:
         logger.error("Servo not initialized! Call setup_gpio() first")
         return
         
-    duty = angle_to_duty(angle_deg)
-    servo_pwm.ChangeDutyCycle(duty)
+    global _pending_angle, _servo_timer
     
-    # Small delay to allow servo to move
-    time.sleep(0.1)
+    # Doesn't wait for the servo to get there - the caller's loop sets the pace
+    with _servo_lock:
+        _pending_angle = angle_deg
+        wait = SERVO_MIN_INTERVAL - (time.monotonic() - _last_servo_cmd_ts)
+        if wait <= 0:
+            _apply_pending_angle_locked()
+        elif _servo_timer is None:
+            # Too soon - apply whatever the latest angle is once the period is up
+            _servo_timer = threading.Timer(wait, _apply_pending_angle)
+            _servo_timer.daemon = True
+            _servo_timer.start()
+
+def _apply_pending_angle_locked() -> None:
+    """Send the pending angle to the servo. Caller must hold _servo_lock."""
+    global _pending_angle, _last_servo_cmd_ts
+    if _pending_angle is None or servo_pwm is None:
+        return
+    servo_pwm.ChangeDutyCycle(angle_to_duty(_pending_angle))
+    _pending_angle = None
+    _last_servo_cmd_ts = time.monotonic()
+
+def _apply_pending_angle() -> None:
+    """Timer callback for a coalesced servo command."""
+    global _servo_timer
+    with _servo_lock:
+        _servo_timer = None
+        _apply_pending_angle_locked()
 
 def cleanup_gpio() -> None:
     """Cleanup GPIO state - should be called on program exit."""
+    global _pending_angle, _servo_timer
+    with _servo_lock:
+        if _servo_timer is not None:
+            _servo_timer.cancel()
+        # Forget the cancelled command so a later setup_gpio starts clean
+        _servo_timer = None
+        _pending_angle = None
     if servo_pwm is not None:
         servo_pwm.stop()
     GPIO.cleanup()
@@ -1,5 +1,6 @@
+import math
+
 import cv2
-import numpy as np
 
 def draw_led(frame, is_hazard):
     """Draw a hazard indicator LED in top-left corner.
@@ -23,10 +24,10 @@ def draw_servo_arrow(frame, angle_deg):
     center = (w - 50, h - 50)  # Bottom right position
     length = 40
     # Convert angle to radians and calculate arrow endpoint
-    angle_rad = np.deg2rad(angle_deg - 90)  # Subtract 90 to make 0 degrees point up
+    angle_rad = math.radians(angle_deg - 90)  # Subtract 90 to make 0 degrees point up
     end_point = (
-        int(center[0] + length * np.cos(angle_rad)),
-        int(center[1] + length * np.sin(angle_rad))
+        int(center[0] + length * math.cos(angle_rad)),
+        int(center[1] + length * math.sin(angle_rad))
     )
     cv2.arrowedLine(frame, center, end_point, (0, 255, 255), 2, tipLength=0.3)
 
@@ -1,21 +1,33 @@
 import cv2
 import math
 
+from src.slim1.ui import render_sprite, blit_sprite
+
 class IndicatorSimulator:
     def __init__(self):
         self.is_hazard = False
+        self._led_sprites = {}  # is_hazard -> pre-rendered LED + label
+
+    def _draw_led(self, frame, is_hazard):
+        led_center = (30, 30)
+        color = (0,0,255) if is_hazard else (0,255,0)   # BGR
+        cv2.circle(frame, led_center, 12, color, -1)
+        cv2.putText(frame, "HAZARD" if is_hazard else "SAFE", (50,36),
+                    cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255,255,255), 2)
 
     def set_hazard(self, state: bool):
         self.is_hazard = bool(state)
 
     def draw(self, frame, angle_deg=None):
         h, w = frame.shape[:2]
-        # LED indicator (top-left)
-        led_center = (30, 30)
-        color = (0,0,255) if self.is_hazard else (0,255,0)   # BGR
-        cv2.circle(frame, led_center, 12, color, -1)
-        cv2.putText(frame, "HAZARD" if self.is_hazard else "SAFE", (50,36),
-                    cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255,255,255), 2)
+        # LED indicator (top-left) - fixed pixels, so rendered once per state
+        sprite = self._led_sprites.get(self.is_hazard)
+        if sprite is None:
+            is_hazard = self.is_hazard
+            sprite = render_sprite(lambda img: self._draw_led(img, is_hazard), (140, 48))
+            self._led_sprites[is_hazard] = sprite
+        if not blit_sprite(frame, sprite):
+            self._draw_led(frame, self.is_hazard)
 
         # Servo arrow (bottom-left)
         base = (60, h-60)
@@ -2,11 +2,66 @@
 Makes the video feed look nice - draws boxes around stuff we found,
 adds status info, and shows where the camera is pointing.
 Keep it simple but informative.
+
+Everything here works on plain numpy frames. Don't bother passing a cv2.UMat:
+OpenCV's drawing functions have no OpenCL versions, so a UMat just gets mapped
+back to host memory for every call (and polylines won't take one at all).
 """
 
+import math
+from typing import Callable, Dict, Tuple
+
 import cv2
 import numpy as np
 
+# Pre-rendered status overlays, one per state string
+_STATUS_SPRITES: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+
+def render_sprite(draw: Callable[[np.ndarray], None],
+                  size: Tuple[int, int]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Rasterize some fixed drawing once so it can be blitted every frame.
+    
+    The drawing is done on an all-black and an all-white canvas; pixels that
+    come out the same on both were painted, everything else is background.
+    
+    Args:
+        draw: Function that draws onto the image it's given (frame coordinates)
+        size: Canvas size as (width, height), anchored at the frame's top-left
+        
+    Returns:
+        Tuple of (BGR pixels, HxWx1 bool mask of painted pixels)
+    """
+    w, h = size
+    black = np.zeros((h, w, 3), np.uint8)
+    white = np.full((h, w, 3), 255, np.uint8)
+    draw(black)
+    draw(white)
+    mask = (black == white).all(axis=2, keepdims=True)
+    return black, mask
+
+def blit_sprite(frame: np.ndarray, sprite: Tuple[np.ndarray, np.ndarray]) -> bool:
+    """
+    Copy a render_sprite result onto the top-left of frame (painted pixels only).
+    
+    Frames smaller than the sprite are left alone: OpenCV clips strokes at
+    the image edge a little differently than a cropped sprite would, so the
+    caller should just draw those the normal way.
+    
+    Args:
+        frame: BGR numpy array
+        sprite: (pixels, mask) from render_sprite
+        
+    Returns:
+        True if the sprite was copied, False if the frame is too small
+    """
+    pixels, mask = sprite
+    h, w = pixels.shape[:2]
+    if frame.shape[0] < h or frame.shape[1] < w:
+        return False
+    np.copyto(frame[:h, :w], pixels, where=mask)
+    return True
+
 def draw_bounding_boxes(frame: np.ndarray, detections: list) -> None:
     """
     Draw detection bounding boxes on frame.
@@ -15,22 +70,24 @@ def draw_bounding_boxes(frame: np.ndarray, detections: list) -> None:
         frame: BGR numpy array
         detections: List of detection dictionaries with x,y,w,h coordinates
     """
-    for det in detections:
-        # Get coordinates
-        x = det.get('x', 0)
-        y = det.get('y', 0)
-        w = det.get('w', 0)
-        h = det.get('h', 0)
+    if not detections:
+        return
         
-        # Draw rectangle
-        cv2.rectangle(frame, (x, y), (x + w, y + h), (0, 0, 255), 2)
-        
-        # Draw confidence if available
+    # All boxes as one int32 array, then one polylines call for the lot
+    coords = np.array(
+        [(d.get('x', 0), d.get('y', 0), d.get('w', 0), d.get('h', 0)) for d in detections],
+        dtype=np.int32
+    )
+    coords[:, 2:] += coords[:, :2]  # w,h -> x2,y2
+    corners = coords[:, [0, 1, 2, 1, 2, 3, 0, 3]].reshape(-1, 4, 2)
+    cv2.polylines(frame, corners, isClosed=True, color=(0, 0, 255), thickness=2)
+    
+    # Draw confidence if available
+    for (x, y), det in zip(coords[:, :2].tolist(), detections):
         if 'conf' in det:
-            conf = det['conf']
             cv2.putText(
                 frame,
-                f"{conf:.2f}",
+                f"{det['conf']:.2f}",
                 (x, y - 5),
                 cv2.FONT_HERSHEY_SIMPLEX,
                 0.5,
@@ -38,14 +95,8 @@ def draw_bounding_boxes(frame: np.ndarray, detections: list) -> None:
                 1
             )
 
-def draw_status_overlay(frame: np.ndarray, state: str) -> None:
-    """
-    Draw status text and LED indicator.
-    
-    Args:
-        frame: BGR numpy array
-        state: "SAFE" or "HAZARD"
-    """
+def _draw_status(frame: np.ndarray, state: str) -> None:
+    """Status text and LED indicator, drawn the slow way."""
     # Status text
     color = (0, 255, 0) if state == "SAFE" else (0, 0, 255)
     cv2.putText(
@@ -64,6 +115,26 @@ def draw_status_overlay(frame: np.ndarray, state: str) -> None:
     cv2.circle(frame, center, radius, color, -1)
     cv2.circle(frame, center, radius, (255, 255, 255), 1)
 
+def draw_status_overlay(frame: np.ndarray, state: str) -> None:
+    """
+    Draw status text and LED indicator.
+    
+    It's the same few pixels every frame, so each state is rendered once and
+    then just copied in.
+    
+    Args:
+        frame: BGR numpy array
+        state: "SAFE" or "HAZARD"
+    """
+    sprite = _STATUS_SPRITES.get(state)
+    if sprite is None:
+        (text_w, _), _ = cv2.getTextSize(state, cv2.FONT_HERSHEY_SIMPLEX, 1.0, 2)
+        size = (max(10 + text_w + 4, 45), 75)
+        sprite = render_sprite(lambda img: _draw_status(img, state), size)
+        _STATUS_SPRITES[state] = sprite
+    if not blit_sprite(frame, sprite):
+        _draw_status(frame, state)
+
 def draw_servo_indicator(frame: np.ndarray, angle: float) -> None:
     """
     Draw arrow indicating servo angle.
@@ -76,10 +147,11 @@ def draw_servo_indicator(frame: np.ndarray, angle: float) -> None:
     center = (frame.shape[1] - 50, height - 50)
     
     # Convert angle to radians and calculate arrow end point
-    angle_rad = np.radians(angle)
+    # (math, not numpy - it's a single scalar so numpy's dispatch cost dominates)
+    angle_rad = math.radians(angle)
     length = 30
-    end_x = int(center[0] + length * np.cos(angle_rad))
-    end_y = int(center[1] - length * np.sin(angle_rad))
+    end_x = int(center[0] + length * math.cos(angle_rad))
+    end_y = int(center[1] - length * math.sin(angle_rad))
     
     # Draw arrow
     cv2.arrowedLine(
@@ -1,10 +1,90 @@
+import logging
 from typing import Literal, Optional
 
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Integer codes used by update_many
+STATE_SAFE = 0
+STATE_HAZARD = 1
+_STATE_NAMES = ('SAFE', 'HAZARD')
+
+# Counters stop here instead of growing forever on a long steady run. It's
+# the largest int CPython stores in a single digit, and way past any
+# transition threshold, so the state logic never notices.
+COUNTER_CAP = (1 << 30) - 1
+
+def _debounce_run(flags, state, hazard_counter, safe_counter,
+                  safe_to_hazard, hazard_to_safe, out):
+    """
+    Run the debounce logic over a whole sequence of frame flags.
+    
+    Args:
+        flags: 1-D bool array, True for hazard frames
+        state: Starting state code (STATE_SAFE / STATE_HAZARD)
+        hazard_counter: Starting consecutive hazard count
+        safe_counter: Starting consecutive safe count
+        safe_to_hazard: Frames needed to go SAFE -> HAZARD
+        hazard_to_safe: Frames needed to go HAZARD -> SAFE
+        out: int8 array (same length as flags) that gets the state after each frame
+        
+    Returns:
+        Tuple of (state, hazard_counter, safe_counter) after the last frame
+    """
+    for i in range(flags.shape[0]):
+        if flags[i]:
+            if hazard_counter < COUNTER_CAP:
+                hazard_counter += 1
+            safe_counter = 0
+            if state == 0 and hazard_counter >= safe_to_hazard:
+                state = 1
+        else:
+            if safe_counter < COUNTER_CAP:
+                safe_counter += 1
+            hazard_counter = 0
+            if state == 1 and safe_counter >= hazard_to_safe:
+                state = 0
+        out[i] = state
+    return state, hazard_counter, safe_counter
+
+# Compiled _debounce_run, built on the first update_many call. Importing
+# numba and compiling takes most of a second, and update() never needs it
+_debounce_kernel = None
+
+def _get_debounce_kernel():
+    """
+    Get the Numba-compiled _debounce_run, compiling it on first use.
+    Falls back to the plain Python loop if numba is missing or the compile
+    (or a stale on-disk cache) fails.
+    """
+    global _debounce_kernel
+    if _debounce_kernel is None:
+        try:
+            from numba import njit
+            # Explicit signature so the one compile happens here (loaded from
+            # the on-disk cache after the first run), not per argument type
+            _debounce_kernel = njit(
+                'UniTuple(i8, 3)(b1[:], i8, i8, i8, i8, i8, i1[:])',
+                cache=True
+            )(_debounce_run)
+        except ImportError:
+            logger.info("numba not available - DebounceState.update_many runs in plain Python")
+            _debounce_kernel = _debounce_run
+        except Exception as e:
+            logger.warning(f"Could not compile debounce kernel, update_many runs in plain Python: {str(e)}")
+            _debounce_kernel = _debounce_run
+    return _debounce_kernel
+
 class DebounceState:
     """
     Handles switching between safe/hazard states but isn't too jumpy about it.
     Waits for a few frames of the same thing before changing its mind.
     Helps avoid false alarms from random blips in the detector.
+    
+    update() stays plain Python on purpose - for one frame at a time that's
+    faster than calling into Numba. update_many() is the one to use when you
+    have a whole run of frames (e.g. replaying a log).
     """
     
     States = Literal['SAFE', 'HAZARD']
@@ -38,12 +118,12 @@ class DebounceState:
         
     @property
     def consecutive_hazard_frames(self) -> int:
-        """Get the number of consecutive hazard frames."""
+        """Get the number of consecutive hazard frames (saturates at COUNTER_CAP)."""
         return self._hazard_counter
         
     @property
     def consecutive_safe_frames(self) -> int:
-        """Get the number of consecutive safe frames."""
+        """Get the number of consecutive safe frames (saturates at COUNTER_CAP)."""
         return self._safe_counter
         
     def update(self, is_hazard_frame: bool) -> States:
@@ -57,7 +137,8 @@ class DebounceState:
             Current state after update
         """
         if is_hazard_frame:
-            self._hazard_counter += 1
+            if self._hazard_counter < COUNTER_CAP:
+                self._hazard_counter += 1
             self._safe_counter = 0
             
             # Check if we should transition to HAZARD
@@ -66,7 +147,8 @@ class DebounceState:
                 self._current_state = 'HAZARD'
                 
         else:
-            self._safe_counter += 1
+            if self._safe_counter < COUNTER_CAP:
+                self._safe_counter += 1
             self._hazard_counter = 0
             
             # Check if we should transition to SAFE
@@ -76,6 +158,32 @@ class DebounceState:
                 
         return self._current_state
         
+    def update_many(self, hazard_flags) -> np.ndarray:
+        """
+        Feed a whole sequence of frame classifications through the state
+        machine in one go. Ends up in the same state as calling update()
+        once per flag.
+        
+        Args:
+            hazard_flags: Sequence/array of bools, True for hazard frames
+            
+        Returns:
+            int8 array with the state code (STATE_SAFE / STATE_HAZARD) after each frame
+        """
+        flags = np.asarray(hazard_flags, dtype=np.bool_)
+        out = np.empty(flags.shape[0], dtype=np.int8)
+        state, self._hazard_counter, self._safe_counter = _get_debounce_kernel()(
+            flags,
+            _STATE_NAMES.index(self._current_state),
+            self._hazard_counter,
+            self._safe_counter,
+            self._safe_to_hazard_frames,
+            self._hazard_to_safe_frames,
+            out
+        )
+        self._current_state = _STATE_NAMES[state]
+        return out
+        
     def reset(self, new_state: Optional[States] = None):
         """
         Reset the state machine.
@@ -1,9 +1,22 @@
-import math
+"""
+Little geometry helpers for turning detections into where the camera
+should point. This is the only copy - import it from src.utils1.geometry.
+"""
+
+import numpy as np
 
 def bbox_center(bbox):
     x1,y1,x2,y2 = bbox
     return ((x1+x2)/2.0, (y1+y2)/2.0)
 
+def bbox_centers(bboxes):
+    """
+    Centers of a whole batch of (x1, y1, x2, y2) boxes at once.
+    Returns an (N, 2) array of (cx, cy).
+    """
+    bboxes = np.asarray(bboxes, dtype=np.float32).reshape(-1, 4)
+    return (bboxes[:, :2] + bboxes[:, 2:]) * 0.5
+
 def pixel_to_angle(center_x, frame_width, hfov_deg=60.0):
     """
     Figures out what angle we need to turn the camera.
@@ -13,3 +26,10 @@ def pixel_to_angle(center_x, frame_width, hfov_deg=60.0):
     dx = center_x - (frame_width / 2.0)
     angle = (dx / (frame_width / 2.0)) * (hfov_deg / 2.0)
     return angle
+
+def pixel_to_angles(center_xs, frame_width, hfov_deg=60.0):
+    """
+    Same as pixel_to_angle but for an array of x positions in one shot.
+    """
+    center_xs = np.asarray(center_xs, dtype=np.float32)
+    return (center_xs / (frame_width * 0.5) - 1.0) * (hfov_deg * 0.5)
@@ -1,29 +1,88 @@
 import cv2
 import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
 
-def video_frame_generator(video_path):
-    cap = cv2.VideoCapture(video_path)
+def open_capture(source, width=640, height=480, fourcc='MJPG'):
+    """
+    Open a VideoCapture. For a live camera (int index) also ask for MJPEG at
+    the given size - the camera compresses, so we skip YUYV conversion and
+    USB bandwidth - and a 1-frame buffer so frames don't go stale.
+    Video files are opened as-is.
+    """
+    cap = cv2.VideoCapture(source)
+    if isinstance(source, int) and cap.isOpened():
+        if fourcc:
+            cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*fourcc))
+        if width and height:
+            cap.set(cv2.CAP_PROP_FRAME_WIDTH, width)
+            cap.set(cv2.CAP_PROP_FRAME_HEIGHT, height)
+        cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+    return cap
+
+def video_frame_generator(video_path, step=1, width=640, height=480, fourcc='MJPG'):
+    cap = open_capture(video_path, width, height, fourcc)
     if not cap.isOpened():
         raise IOError(f"Cannot open video {video_path}")
+    idx = 0
     while True:
-        ret, frame = cap.read()
-        if not ret:
+        # grab() just advances; only frames we keep get decoded by retrieve()
+        if not cap.grab():
             break
-        yield frame
+        if idx % step == 0:
+            ret, frame = cap.retrieve()
+            if not ret:
+                break
+            yield frame
+        idx += 1
     cap.release()
 
-def extract_frames(video_path, out_dir, step=30):
+def _encode_params(image_format, quality):
+    if image_format == 'webp':
+        return [cv2.IMWRITE_WEBP_QUALITY, quality]
+    # Baseline, non-optimized Huffman tables - the quick JPEG path
+    return [cv2.IMWRITE_JPEG_QUALITY, quality,
+            cv2.IMWRITE_JPEG_PROGRESSIVE, 0,
+            cv2.IMWRITE_JPEG_OPTIMIZE, 0]
+
+def _save_image(path, frame, params):
+    ok, buf = cv2.imencode(os.path.splitext(path)[1], frame, params)
+    if ok:
+        with open(path, 'wb') as f:
+            f.write(buf.tobytes())
+
+def extract_frames(video_path, out_dir, step=30, workers=4, quality=85, image_format='jpg',
+                   width=640, height=480, fourcc='MJPG'):
     os.makedirs(out_dir, exist_ok=True)
-    cap = cv2.VideoCapture(video_path)
+    cap = open_capture(video_path, width, height, fourcc)
+    # Encoding + disk writes run on a pool so decoding never waits on
+    # them; the semaphore caps how many frames can sit in memory
+    pool = ThreadPoolExecutor(max_workers=workers)
+    pending = threading.BoundedSemaphore(workers * 2)
+    params = _encode_params(image_format, quality)
+
+    def save(path, frame):
+        try:
+            _save_image(path, frame, params)
+        finally:
+            pending.release()
+
     idx, saved = 0, 0
-    while True:
-        ret, frame = cap.read()
-        if not ret:
-            break
-        if idx % step == 0:
-            fname = os.path.join(out_dir, f"frame_{saved:06d}.jpg")
-            cv2.imwrite(fname, frame)
-            saved += 1
-        idx += 1
-    cap.release()
+    try:
+        while True:
+            if not cap.grab():
+                break
+            if idx % step == 0:
+                ret, frame = cap.retrieve()
+                if not ret:
+                    break
+                fname = os.path.join(out_dir, f"frame_{saved:06d}.{image_format}")
+                # retrieve() hands back a fresh array, so no copy needed
+                pending.acquire()
+                pool.submit(save, fname, frame)
+                saved += 1
+            idx += 1
+    finally:
+        pool.shutdown(wait=True)
+        cap.release()
     return saved
@@ -7,8 +7,9 @@ Supports both image and video/webcam input.
 import cv2
 import numpy as np
 import os
+import queue
 import sys
-import os
+import threading
 
 # Add the project root directory to Python path
 project_root = os.path.dirname(os.path.abspath(__file__))
@@ -25,6 +26,32 @@ except ImportError:
 
 from src.io.camera import VideoSource
 
+_FONT = cv2.FONT_HERSHEY_SIMPLEX
+
+# Frames are drawn on as plain numpy arrays on purpose: OpenCV's drawing
+# functions have no OpenCL path, so wrapping frames in cv2.UMat would only add
+# an upload/download per frame (see src/slim1/ui.py).
+
+def draw_boxes(image, boxes):
+    """Draw classic detector boxes, given as (x, y, w, h), onto the image."""
+    for x, y, w, h in boxes:
+        cv2.rectangle(image, (x, y), (x + w, y + h), (0, 255, 0), 2)
+
+def draw_detections(image, detections):
+    """Draw detection boxes (and scores if there are any) onto the image."""
+    if not detections:
+        return
+    # Cast every bbox to ints once instead of four int() calls per draw
+    pts = np.asarray([det['bbox'] for det in detections], dtype=np.int32).reshape(-1, 4).tolist()
+    scores = [f"{det['score']:.2f}" if det.get('score') is not None else None
+              for det in detections]
+    
+    for (x1, y1, x2, y2), score in zip(pts, scores):
+        cv2.rectangle(image, (x1, y1), (x2, y2), (0, 255, 0), 2)
+        if score is not None:
+            cv2.putText(image, score, (x1, y1 - 10),
+                       _FONT, 0.5, (0, 255, 0), 2)
+
 def process_image(image_path, detector_type='classic'):
     """Process a single image."""
     # Read image
@@ -32,75 +59,127 @@ def process_image(image_path, detector_type='classic'):
     if image is None:
         raise ValueError(f"Could not read image: {image_path}")
     
-    # Create detectors
-    detections = []
-    if detector_type == 'classic':
-        boxes, lines, mask = detect_hazards_classic(image)
-        detections = [{'bbox': box, 'score': None, 'method': 'classic'} for box in boxes]
-    elif detector_type == 'yolo':
-        if not YOLO_AVAILABLE:
+    # Run the detector and draw what it found
+    if detector_type == 'yolo' and YOLO_AVAILABLE:
+        detector = YOLODetector('yolov8n.pt')  # Using YOLOv8 nano model
+        draw_detections(image, detector.predict(image))
+    else:
+        if detector_type == 'yolo':
             print("YOLO detector not available - falling back to classic detector")
-            boxes, lines, mask = detect_hazards_classic(image)
-            detections = [{'bbox': box, 'score': None, 'method': 'classic'} for box in boxes]
-        else:
-            detector = YOLODetector(weights='yolov8n.pt')  # Using YOLOv8 nano model
-            detections = detector.detect(image)
-    
-    # Draw detections
-    for det in detections:
-        bbox = det['bbox']
-        cv2.rectangle(image, (int(bbox[0]), int(bbox[1])), 
-                     (int(bbox[2]), int(bbox[3])), (0, 255, 0), 2)
-        
-        if 'score' in det and det['score'] is not None:
-            score = f"{det['score']:.2f}"
-            cv2.putText(image, score, (int(bbox[0]), int(bbox[1])-10),
-                       cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 255, 0), 2)
-    
+        boxes, lines, mask = detect_hazards_classic(image)
+        draw_boxes(image, boxes)
     return image
 
-def process_video(source=0, detector_type='classic'):
-    """Process video or webcam feed."""
+def process_video(source=0, detector_type='classic', prefetch=2, display=True, display_every=1):
+    """
+    Process video or webcam feed.
+    
+    Runs as a three-stage pipeline so decoding, detection and display
+    overlap: a reader thread feeds frames to a detector thread, and the main
+    thread draws and shows the results (OpenCV windows want the main thread).
+    Both detectors, classic included, run on the detector thread, so decoding
+    frame N+1 overlaps detecting frame N. The queues between stages hold at
+    most `prefetch` items.
+    
+    With display=False the GUI is skipped entirely (no imshow/waitKey), for
+    headless batch runs. display_every=K only shows every Kth frame.
+    
+    Returns:
+        Number of frames processed
+    """
+    # Load the model once up front, not once per frame. Done before the
+    # camera is opened so a missing weights file doesn't leave it running
+    detector = None
+    if detector_type == 'yolo':
+        if YOLO_AVAILABLE:
+            detector = YOLODetector('yolov8n.pt')
+        else:
+            print("YOLO detector not available - falling back to classic detector")
+    
     video = VideoSource(source, width=640, height=480)
+    video.start()
+    
+    draw = draw_detections if detector is not None else draw_boxes
+    
+    read_q = queue.Queue(maxsize=prefetch)
+    draw_q = queue.Queue(maxsize=prefetch)
+    stop = threading.Event()
+    
+    def put(q, item):
+        """Blocking put that gives up once we're shutting down."""
+        while not stop.is_set():
+            try:
+                q.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+        return False
+    
+    def get(q):
+        """Blocking get that returns None (end of stream) once we're shutting down."""
+        while not stop.is_set():
+            try:
+                return q.get(timeout=0.1)
+            except queue.Empty:
+                pass
+        return None
+    
+    def reader():
+        try:
+            while not stop.is_set():
+                ret, frame = video.read()
+                if not ret or not put(read_q, frame):
+                    break
+        finally:
+            put(read_q, None)  # end of stream
     
+    def infer():
+        try:
+            while True:
+                frame = get(read_q)
+                if frame is None:
+                    break
+                if detector is not None:
+                    found = detector.predict(frame)
+                else:
+                    # Classic boxes go straight to drawing, no per-box dicts
+                    found, lines, mask = detect_hazards_classic(frame)
+                if not put(draw_q, (frame, found)):
+                    break
+        finally:
+            put(draw_q, None)
+    
+    workers = [threading.Thread(target=reader, daemon=True),
+               threading.Thread(target=infer, daemon=True)]
+    for worker in workers:
+        worker.start()
+    
+    frame_count = 0
     try:
         while True:
-            ret, frame = video.read()
-            if not ret:
+            item = get(draw_q)
+            if item is None:
                 break
+            frame, found = item
+            frame_count += 1
             
-            # Process frame
-            if detector_type == 'classic':
-                boxes, lines, mask = detect_hazards_classic(frame)
-                detections = [{'bbox': box, 'score': None, 'method': 'classic'} for box in boxes]
-            elif detector_type == 'yolo':
-                if not YOLO_AVAILABLE:
-                    print("YOLO detector not available - falling back to classic detector")
-                    boxes, lines, mask = detect_hazards_classic(frame)
-                    detections = [{'bbox': box, 'score': None, 'method': 'classic'} for box in boxes]
-                else:
-                    detector = YOLODetector(weights='yolov8n.pt')
-                    detections = detector.detect(frame)
-            
-            # Draw detections
-            for det in detections:
-                bbox = det['bbox']
-                cv2.rectangle(frame, (int(bbox[0]), int(bbox[1])), 
-                            (int(bbox[2]), int(bbox[3])), (0, 255, 0), 2)
-                
-                if 'score' in det and det['score'] is not None:
-                    score = f"{det['score']:.2f}"
-                    cv2.putText(frame, score, (int(bbox[0]), int(bbox[1])-10),
-                               cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 255, 0), 2)
+            draw(frame, found)
             
             # Show results
-            cv2.imshow('Power Line Inspection', frame)
-            if cv2.waitKey(1) & 0xFF == ord('q'):
-                break
+            if display and frame_count % display_every == 0:
+                cv2.imshow('Power Line Inspection', frame)
+                if cv2.waitKey(1) & 0xFF == ord('q'):
+                    break
     
     finally:
-        video.stop()
-        cv2.destroyAllWindows()
+        stop.set()
+        for worker in workers:
+            worker.join()
+        video.release()
+        if display:
+            cv2.destroyAllWindows()
+    
+    return frame_count
 
 if __name__ == "__main__":
     import argparse
@@ -111,6 +190,10 @@ if __name__ == "__main__":
                         default='classic', help='Detector type (default: classic)')
     parser.add_argument('--output', type=str, default=None,
                         help='Output path for processed image/video (optional)')
+    parser.add_argument('--display', action=argparse.BooleanOptionalAction, default=True,
+                        help='Show results in a window (--no-display for headless runs)')
+    parser.add_argument('--display-every', type=int, default=1,
+                        help='Only show every Nth video frame (default: 1)')
     
     args = parser.parse_args()
     
@@ -120,9 +203,10 @@ if __name__ == "__main__":
         result = process_image(args.input, args.detector)
         
         # Show result
-        cv2.imshow('Power Line Inspection', result)
-        cv2.waitKey(0)
-        cv2.destroyAllWindows()
+        if args.display:
+            cv2.imshow('Power Line Inspection', result)
+            cv2.waitKey(0)
+            cv2.destroyAllWindows()
         
         # Save if output path provided
         if args.output:
@@ -136,4 +220,7 @@ if __name__ == "__main__":
         except ValueError:
             source = args.input  # Use as video path
         
-        process_video(source, args.detector)
+        frames = process_video(source, args.detector, display=args.display,
+                               display_every=max(1, args.display_every))
+        if not args.display:
+            print(f"Processed {frames} frames")